@@ -0,0 +1,148 @@
+import atexit
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from config import (
+    ANSWER_CACHE_FLUSH, ANSWER_CACHE_PATH, ANSWER_CACHE_SIZE, ANSWER_CACHE_TTL, FAISS_INDEX_PATH,
+    SEMANTIC_CACHE_THRESHOLD,
+)
+from index_store import index_fingerprint
+
+
+def normalize_query(query):
+    query = re.sub(r"[^\w\s]", " ", query.lower())
+    return " ".join(query.split())
+
+
+class AnswerCache:
+    # Two-level answer cache.
+    # Level one: exact match on the normalised user text, checked before anything else.
+    # Level two: cosine similarity between rephrased-query embeddings, checked after the
+    # query has been embedded but before FAISS search and answer generation.
+    # Both levels share one LRU-ordered, TTL-bounded store that is persisted to JSON and
+    # discarded whenever the FAISS index fingerprint changes. Answers stored without a
+    # vector (section-number lookups, which are never embedded) only hit at level one.
+    # New answers are written in batches of `flush_every` (and at exit), outside the lock
+    # that lookups take.
+
+    def __init__(self, path=ANSWER_CACHE_PATH, index_path=FAISS_INDEX_PATH, max_entries=ANSWER_CACHE_SIZE,
+                 ttl=ANSWER_CACHE_TTL, threshold=SEMANTIC_CACHE_THRESHOLD, flush_every=ANSWER_CACHE_FLUSH):
+        self.path = path
+        self.index_path = index_path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        self.flush_every = flush_every
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.unsaved = 0
+        self.stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0}
+        self.entries = OrderedDict()
+        self.fingerprint = index_fingerprint(index_path)
+        self._matrix = None
+        self._matrix_keys = []
+        self._load()
+        if path:
+            atexit.register(self.flush)
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("fingerprint") != self.fingerprint:
+            return
+        for key, entry in data["entries"]:
+            self.entries[key] = entry
+        self._expire()
+
+    def flush(self):
+        # Writes the cache if it has unsaved answers. The snapshot is taken under the lock;
+        # serialising it (vectors included) and the file write happen outside it.
+        if not self.path:
+            return
+        with self.write_lock:
+            with self.lock:
+                if not self.unsaved:
+                    return
+                self.unsaved = 0
+                data = {"fingerprint": self.fingerprint, "entries": list(self.entries.items())}
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+
+    def _check_index(self):
+        fingerprint = index_fingerprint(self.index_path)
+        if fingerprint != self.fingerprint:
+            self.fingerprint = fingerprint
+            self.entries.clear()
+            self._matrix = None
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl
+        expired = [key for key, entry in self.entries.items() if entry["created"] < cutoff]
+        for key in expired:
+            del self.entries[key]
+        evicted = 0
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            evicted += 1
+        if expired or evicted:
+            self._matrix = None
+
+    def get_exact(self, query):
+        with self.lock:
+            self._check_index()
+            self._expire()
+            key = normalize_query(query)
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+            self.stats["exact_hits"] += 1
+            return entry["answer"]
+
+    def get_semantic(self, vector):
+        with self.lock:
+            self._check_index()
+            self._expire()
+            if self._matrix is None:
+                self._matrix_keys = [key for key, entry in self.entries.items() if entry["vector"] is not None]
+                self._matrix = np.array([self.entries[key]["vector"] for key in self._matrix_keys], dtype=np.float32)
+            if not self._matrix_keys:
+                self.stats["misses"] += 1
+                return None
+            query = np.array(vector, dtype=np.float32)
+            query /= np.linalg.norm(query) or 1.0
+            scores = self._matrix @ query
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                self.stats["misses"] += 1
+                return None
+            key = self._matrix_keys[best]
+            self.entries.move_to_end(key)
+            self.stats["semantic_hits"] += 1
+            return self.entries[key]["answer"]
+
+    def put(self, query, vector, answer):
+        if vector is not None:
+            vector = np.array(vector, dtype=np.float32)
+            vector /= np.linalg.norm(vector) or 1.0
+            vector = vector.tolist()
+        with self.lock:
+            key = normalize_query(query)
+            self.entries[key] = {"answer": answer, "vector": vector, "created": time.time()}
+            self.entries.move_to_end(key)
+            self._expire()
+            self._matrix = None
+            self.unsaved += 1
+            due = self.unsaved >= self.flush_every
+        if due:
+            self.flush()
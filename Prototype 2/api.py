@@ -0,0 +1,209 @@
+import argparse
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from pydantic import BaseModel
+
+from batch_embeddings import SATURATED_STATUS
+from config import API_MAX_IN_FLIGHT, API_MAX_QUEUE, API_QUEUE_TIMEOUT
+from service import LegalAidService
+
+# Headless HTTP API over LegalAidService.
+#
+#   POST /query          {"query": "...", "skip_rephrase": null}  -> one JSON answer
+#   POST /query/stream   same body -> NDJSON: a header line, {"token": ...} lines, a final {"done": true} line
+#   GET  /health
+#   GET  /metrics        Prometheus latency histograms (see tracing.py)
+#
+# The pipeline is blocking, so it runs in worker threads while the event loop keeps accepting
+# connections. Requests that need the LLM pass through LLMGate: at most API_MAX_IN_FLIGHT run
+# at once, up to API_MAX_QUEUE wait for at most API_QUEUE_TIMEOUT seconds, and the rest get 429
+# straight away. Exact answer-cache hits and IPC -> BNS table lookups (crossref.py) never call the
+# LLM and bypass the gate. A 429/5xx from Ollama is passed on as 429.
+#
+#   python api.py --port 8000
+
+RETRY_AFTER_SECONDS = 1
+
+
+class QueryRequest(BaseModel):
+    query: str
+    skip_rephrase: Optional[bool] = None
+
+
+class Saturated(Exception):
+    pass
+
+
+class LLMGate:
+
+    def __init__(self, max_in_flight=API_MAX_IN_FLIGHT, max_queue=API_MAX_QUEUE, timeout=API_QUEUE_TIMEOUT):
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self.stats = {"admitted": 0, "queue_full": 0, "queue_timeout": 0, "backend_saturated": 0}
+
+    async def acquire(self):
+        if self.semaphore.locked() and self.waiting >= self.max_queue:
+            self.stats["queue_full"] += 1
+            raise Saturated("Too many queued requests.")
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            self.stats["queue_timeout"] += 1
+            raise Saturated(f"No LLM slot became free within {self.timeout:g}s.")
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        self.stats["admitted"] += 1
+
+    def release(self):
+        self.in_flight -= 1
+        self.semaphore.release()
+
+
+def backend_saturated(error):
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status in SATURATED_STATUS
+
+
+def cached_result(service, query):
+    answer = service.answer_cache.get_exact(query)
+    if answer is None:
+        return None
+    return {"answer": answer, "rephrased_query": None, "rephrase": None, "cache": "exact", "sections": [],
+            "documents": [], "timings": {}}
+
+
+def table_lookup(service, query):
+    # Whether the pipeline answers from the IPC -> BNS table (no rephrase, no generation).
+    crossref = service.crossref
+    return crossref is not None and crossref.lookup(query) is not None
+
+
+def result_header(result):
+    return {
+        "trace_id": result["trace"].id if "trace" in result else None,
+        "rephrased_query": result["rephrased_query"],
+        "rephrase": result["rephrase"],
+        "cache": result["cache"],
+        "sections": [section["number"] for section in result["sections"]],
+        "sources": [
+            {key: document.metadata.get(key) for key in ("act", "section", "page")} for document in result["documents"]
+        ],
+    }
+
+
+def ndjson(payload):
+    return json.dumps(payload) + "\n"
+
+
+def create_app(service=None, gate=None):
+    service = service or LegalAidService()
+    gate = gate or LLMGate()
+
+    @asynccontextmanager
+    async def lifespan(app):
+        await asyncio.to_thread(service.ready)
+        yield
+
+    app = FastAPI(title="Generative AI For Legal Aids", lifespan=lifespan)
+    app.state.service = service
+    app.state.gate = gate
+
+    @app.exception_handler(Saturated)
+    async def saturated_handler(request, error):
+        return JSONResponse(
+            {"detail": str(error)}, status_code=429, headers={"Retry-After": str(RETRY_AFTER_SECONDS)}
+        )
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok", "in_flight": gate.in_flight, "waiting": gate.waiting, **gate.stats}
+
+    @app.get("/metrics")
+    async def metrics():
+        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+    @app.post("/query")
+    async def query(request: QueryRequest):
+        result = cached_result(service, request.query)
+        if result is None and table_lookup(service, request.query):
+            result = await asyncio.to_thread(service.answer, request.query, request.skip_rephrase)
+        if result is None:
+            await gate.acquire()
+            try:
+                result = await asyncio.to_thread(service.answer, request.query, request.skip_rephrase)
+            except Exception as error:
+                if backend_saturated(error):
+                    gate.stats["backend_saturated"] += 1
+                    raise Saturated("The LLM backend is saturated.") from error
+                raise
+            finally:
+                gate.release()
+        return {"answer": result["answer"], **result_header(result), "timings": result["timings"]}
+
+    @app.post("/query/stream")
+    async def query_stream(request: QueryRequest):
+        result = cached_result(service, request.query)
+        if result is not None:
+            lines = [ndjson(result_header(result)), ndjson({"token": result["answer"]}), ndjson({"done": True})]
+            return StreamingResponse(iter(lines), media_type="application/x-ndjson")
+
+        # Admission and retrieval happen before the response starts, so both can still fail with a status code.
+        gated = not table_lookup(service, request.query)
+        if gated:
+            await gate.acquire()
+        try:
+            result = await asyncio.to_thread(service.stream, request.query, request.skip_rephrase)
+        except Exception as error:
+            if gated:
+                gate.release()
+            if backend_saturated(error):
+                gate.stats["backend_saturated"] += 1
+                raise Saturated("The LLM backend is saturated.") from error
+            raise
+
+        async def body():
+            try:
+                yield ndjson(result_header(result))
+                tokens = result["stream"]
+                while True:
+                    token = await asyncio.to_thread(next, tokens, None)
+                    if token is None:
+                        break
+                    yield ndjson({"token": token})
+                yield ndjson({"done": True, "timings": result["timings"]})
+            except Exception as error:
+                yield ndjson({"error": str(error)})
+            finally:
+                if gated:
+                    gate.release()
+
+        return StreamingResponse(body(), media_type="application/x-ndjson")
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the legal aid pipeline over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    uvicorn.run(create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import streamlit as st
-import time
-from main import generate_answer_with_rephrase
+from fir import export_docx
+from main import stream_answer_with_rephrase, stream_fir
 
 st.set_page_config(layout="wide")
 
@@ -9,15 +9,20 @@ chat_mode = st.sidebar.selectbox("Choose Option", options=["Get BNS Section Info
 st.title("Generative AI For Legal Aids")
 st.divider()
 
-prompt = st.chat_input("What is up?")
+if chat_mode == "FIR":
+    prompt = st.chat_input("Describe the incident for the FIR")
+    if prompt:
+        draft = {}
+        for part, field, value in stream_fir(prompt):
+            if part not in draft:
+                st.subheader(part)
+                draft[part] = {}
+            st.markdown(f"**{field}:** {value}")
+            draft[part][field] = value
+        st.download_button("Download FIR (.docx)", export_docx(draft, prompt), file_name="FIR.docx")
+    st.stop()
 
-def typewriter_animation(text, speed=5):
-    container = st.empty()  
-    display_str = ""
-    for char in text:
-        display_str += char 
-        container.markdown(f'<div class="msg-container"><p class="big-font">{display_str}</p></div>', unsafe_allow_html=True)
-        time.sleep(1 / speed)  
+prompt = st.chat_input("What is up?")
 
 if prompt:
     st.markdown("""
@@ -34,4 +39,6 @@ if prompt:
         </style>
     """, unsafe_allow_html=True)
 
-    typewriter_animation("Welcome", speed=10)  
+    result = stream_answer_with_rephrase(prompt)
+    with st.chat_message("assistant"):
+        st.write_stream(result["stream"])
@@ -0,0 +1,175 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config import BATCH_LLM_WORKERS, BATCH_SIZE, SECTION_PROMPT_TOP_K
+from pipeline import generation_inputs
+from sections import format_sections
+from service import LegalAidService
+
+# Bulk mapping of complaint narratives to BNS sections.
+#
+# Reads JSONL (one object per line) or CSV (header row), and appends one JSON line per
+# answered query to the output file as soon as it is answered. Rerunning with the same output
+# skips ids already written, so an interrupted run resumes where it stopped.
+#
+# Per batch of BATCH_SIZE queries: rephrasing runs on BATCH_LLM_WORKERS threads, the rephrased
+# queries are embedded (with embed_query, as online) on the same threads and searched in one
+# FAISS matrix search (plus BM25 per query), the optional re-ranker scores every query's
+# candidates in one forward pass, each query's context is cut to the service's token budget,
+# and answers are generated on BATCH_LLM_WORKERS threads. The answer cache is not used, so a
+# large batch cannot evict the interactive users' entries. A query whose rephrase or answer
+# fails is counted as failed and left out of the output, so the next run retries it.
+#
+#   python batch.py complaints.csv results.jsonl --text-field narrative --id-field complaint_no
+
+
+def read_queries(path, text_field, id_field):
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+    return [(str(row.get(id_field) or number), row[text_field]) for number, row in enumerate(rows, start=1)]
+
+
+def completed_ids(path):
+    # Drops a last line cut short by a crash, so appending resumes on a clean line.
+    if not os.path.exists(path):
+        return set()
+    with open(path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            f.truncate(end)
+    return {json.loads(line)["id"] for line in data[:end].decode("utf-8").splitlines() if line.strip()}
+
+
+def matched_sections(documents):
+    sections = []
+    for document in documents:
+        section = document.metadata.get("section")
+        if section is not None and section not in sections:
+            sections.append(section)
+    return sections
+
+
+class BatchRunner:
+
+    def __init__(self, service, output, workers=BATCH_LLM_WORKERS, skip_rephrase=None, log=print):
+        self.service = service
+        self.output = output
+        self.skip_rephrase = skip_rephrase
+        self.log = log
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.write_lock = threading.Lock()
+        self.stats = {"answered": 0, "failed": 0}
+
+    def _write(self, record):
+        with self.write_lock:
+            self.output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.output.flush()
+            self.stats["answered"] += 1
+
+    def _answer(self, query_id, query, rephrased_query, documents, sections):
+        answer = self.service.document_chain.invoke(
+            generation_inputs(query, {"documents": documents, "sections": sections})
+        )
+        self._write({
+            "id": query_id,
+            "query": query,
+            "rephrased_query": rephrased_query,
+            "sections": matched_sections(documents),
+            "answer": answer,
+        })
+
+    def _fail(self, query_id, error):
+        with self.write_lock:
+            self.stats["failed"] += 1
+        print(f"{query_id}: {error}", file=sys.stderr)
+
+    def _rephrase(self, item):
+        query_id, query = item
+        try:
+            return self.service.rephraser.rephrase(query, skip=self.skip_rephrase)[0]
+        except Exception as error:
+            self._fail(query_id, error)
+            return None
+
+    def run_batch(self, batch):
+        service = self.service
+        rephrased = list(self.pool.map(self._rephrase, batch))
+        batch = [item for item, rephrased_query in zip(batch, rephrased) if rephrased_query is not None]
+        rephrased = [rephrased_query for rephrased_query in rephrased if rephrased_query is not None]
+        if not batch:
+            return
+        # embed_query, not embed_documents: embedders may encode queries differently, and the
+        # vectors must match the ones the retriever and section index get online.
+        vectors = list(self.pool.map(service.embeddings.embed_query, rephrased))
+        texts = [f"{query} {rephrased_query}" for (_, query), rephrased_query in zip(batch, rephrased)]
+        k = service.assembler.candidates
+        reranker = service.reranker
+        all_documents = service.hybrid.search_many(texts, vectors, k=reranker.candidates if reranker else k)
+        if reranker is not None:
+            ranked = reranker.rerank_many(rephrased, all_documents, k)
+            all_documents = [[document for document, _ in pairs] for pairs in ranked]
+
+        futures = {}
+        for (query_id, query), rephrased_query, vector, documents in zip(batch, rephrased, vectors, all_documents):
+            sections = []
+            if service.section_index is not None:
+                sections = service.section_index.top_k(vector, SECTION_PROMPT_TOP_K)
+            documents, _ = service.assembler.assemble(documents, query, format_sections(sections))
+            future = self.pool.submit(self._answer, query_id, query, rephrased_query, documents, sections)
+            futures[future] = query_id
+        for future in as_completed(futures):
+            error = future.exception()
+            if error is not None:
+                self._fail(futures[future], error)
+
+    def run(self, queries, batch_size=BATCH_SIZE):
+        start = time.perf_counter()
+        for offset in range(0, len(queries), batch_size):
+            self.run_batch(queries[offset:offset + batch_size])
+            minutes = (time.perf_counter() - start) / 60
+            self.log(
+                f"{min(offset + batch_size, len(queries))}/{len(queries)} done, "
+                f"{self.stats['answered'] / minutes:.1f} queries/min"
+            )
+        self.pool.shutdown()
+        return self.stats, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Map a file of complaint narratives to BNS sections.")
+    parser.add_argument("input", help=".jsonl or .csv")
+    parser.add_argument("output", help="JSONL results; existing ids are skipped")
+    parser.add_argument("--text-field", default="query")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=BATCH_LLM_WORKERS, help="concurrent LLM calls")
+    parser.add_argument("--skip-rephrase", action="store_true", help="search with the raw narratives")
+    args = parser.parse_args()
+
+    queries = read_queries(args.input, args.text_field, args.id_field)
+    done = completed_ids(args.output)
+    pending = [(query_id, query) for query_id, query in queries if query_id not in done]
+    print(f"{len(queries)} queries, {len(done)} already in {args.output}, {len(pending)} to run")
+
+    service = LegalAidService().ready()
+    with open(args.output, "a", encoding="utf-8") as output:
+        runner = BatchRunner(service, output, args.workers, skip_rephrase=args.skip_rephrase or None)
+        stats, seconds = runner.run(pending, args.batch_size)
+    print(
+        f"Answered {stats['answered']}, failed {stats['failed']} in {seconds:.1f}s "
+        f"({stats['answered'] / (seconds / 60):.1f} queries/min)"
+    )
+
+
+if __name__ == "__main__":
+    main()
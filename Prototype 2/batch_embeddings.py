@@ -0,0 +1,100 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from langchain_core.embeddings import Embeddings
+from requests.adapters import HTTPAdapter
+
+# Status codes Ollama (or a proxy in front of it) returns when it cannot take more work.
+SATURATED_STATUS = {429, 502, 503, 504}
+
+
+class AdaptiveLimiter:
+    # AIMD limit on in-flight requests: every success lets one more request through
+    # (up to the worker count), every saturation signal halves the limit.
+
+    def __init__(self, max_limit):
+        self.max_limit = max_limit
+        self.limit = max_limit
+        self.in_flight = 0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        with self.condition:
+            while self.in_flight >= self.limit:
+                self.condition.wait()
+            self.in_flight += 1
+
+    def release(self, saturated):
+        with self.condition:
+            self.in_flight -= 1
+            if saturated:
+                self.limit = max(1, self.limit // 2)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1)
+            self.condition.notify_all()
+
+
+class BatchedOllamaEmbeddings(Embeddings):
+    # Sends texts to Ollama's /api/embed in batches from a pool of workers that share
+    # one keep-alive HTTP session, instead of one request per chunk.
+
+    def __init__(self, model, base_url="http://localhost:11434", batch_size=32, workers=4,
+                 max_retries=6, timeout=120):
+        self.model = model
+        self.url = base_url.rstrip("/") + "/api/embed"
+        self.batch_size = batch_size
+        self.workers = workers
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.limiter = AdaptiveLimiter(workers)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.stats = {"requests": 0, "retries": 0}
+        self.stats_lock = threading.Lock()
+
+    def _count(self, name):
+        with self.stats_lock:
+            self.stats[name] += 1
+
+    def _post_batch(self, texts):
+        delay = 0.1
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            saturated = False
+            try:
+                response = self.session.post(
+                    self.url, json={"model": self.model, "input": texts}, timeout=self.timeout
+                )
+                saturated = response.status_code in SATURATED_STATUS
+                if not saturated:
+                    response.raise_for_status()
+                    self._count("requests")
+                    return response.json()["embeddings"]
+            except (requests.ConnectionError, requests.Timeout):
+                saturated = True
+            finally:
+                self.limiter.release(saturated)
+
+            if attempt == self.max_retries:
+                break
+            self._count("retries")
+            # Exponential backoff with full jitter so the workers don't retry in lockstep.
+            time.sleep(random.uniform(0, delay))
+            delay = min(delay * 2, 10.0)
+        raise RuntimeError(f"Embedding server at {self.url} stayed saturated after {self.max_retries} retries")
+
+    def embed_documents(self, texts):
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if len(batches) <= 1:
+            return self._post_batch(texts) if texts else []
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = executor.map(self._post_batch, batches)
+            return [vector for batch in results for vector in batch]
+
+    def embed_query(self, text):
+        return self._post_batch([text])[0]
@@ -0,0 +1,123 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from collections import Counter
+
+import httpx
+import uvicorn
+
+from api import LLMGate, create_app
+from config import BASE_DIR
+from fakes import FakeEmbeddings, FakeLLM, build_fake_index
+from service import LegalAidService
+
+# Load test for api.py: starts the API on a local port with the fake embedder and a stub
+# LLM, fires concurrent streaming queries at it and reports status codes, time to first
+# token, total latency and throughput.
+#
+#   python bench_api.py --requests 200 --concurrency 50 --max-in-flight 4 --max-queue 16
+
+QUERIES_PATH = os.path.join(BASE_DIR, "data", "bench_queries.json")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def one_request(client, query):
+    start = time.perf_counter()
+    first_token = None
+    async with client.stream("POST", "/query/stream", json={"query": query}) as response:
+        if response.status_code != 200:
+            await response.aread()
+            return response.status_code, None, time.perf_counter() - start
+        async for line in response.aiter_lines():
+            if first_token is None and '"token"' in line:
+                first_token = time.perf_counter() - start
+    return 200, first_token, time.perf_counter() - start
+
+
+async def load(url, queries, requests, concurrency):
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=None) as client:
+        pending = asyncio.Semaphore(concurrency)
+
+        async def bounded(number):
+            async with pending:
+                # Numbered so repeats of the same question do not all come from the answer cache.
+                return await one_request(client, f"{queries[number % len(queries)]} (case {number})")
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(bounded(number) for number in range(requests)))
+        return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the HTTP API against a stub LLM.")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--max-in-flight", type=int, default=4)
+    parser.add_argument("--max-queue", type=int, default=16)
+    parser.add_argument("--queue-timeout", type=float, default=5.0)
+    parser.add_argument("--prompt-latency", type=float, default=0.1, help="stub LLM delay before the first token")
+    parser.add_argument("--token-latency", type=float, default=0.005)
+    parser.add_argument("--queries", default=QUERIES_PATH)
+    args = parser.parse_args()
+
+    with open(args.queries, encoding="utf-8") as f:
+        queries = [item["query"] for item in json.load(f)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = build_fake_index(os.path.join(tmp, "faiss_index"))
+        service = LegalAidService(
+            index_path, llm=FakeLLM(prompt_latency=args.prompt_latency, token_latency=args.token_latency),
+            embeddings=FakeEmbeddings(), cache_path=None, rephrase_memo_path=None, log=lambda *a: None,
+        )
+        gate = LLMGate(args.max_in_flight, args.max_queue, args.queue_timeout)
+        port = free_port()
+        server = uvicorn.Server(uvicorn.Config(create_app(service, gate), port=port, log_level="warning"))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.05)
+
+        try:
+            results, elapsed = asyncio.run(load(f"http://127.0.0.1:{port}", queries, args.requests, args.concurrency))
+        finally:
+            server.should_exit = True
+            thread.join()
+
+    statuses = Counter(status for status, _, _ in results)
+    ok = [(first, total) for status, first, total in results if status == 200]
+    print(
+        f"{args.requests} requests, {args.concurrency} concurrent clients, "
+        f"{args.max_in_flight} in flight, queue {args.max_queue}, timeout {args.queue_timeout:g}s"
+    )
+    print("status codes: " + ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items())))
+    print(f"gate: {gate.stats}")
+    if ok:
+        first_tokens = [first for first, _ in ok if first is not None]
+        totals = [total for _, total in ok]
+        print(
+            f"first token p50 {statistics.median(first_tokens) * 1000:.0f} ms, "
+            f"p95 {percentile(first_tokens, 0.95) * 1000:.0f} ms | "
+            f"total p50 {statistics.median(totals) * 1000:.0f} ms, p95 {percentile(totals, 0.95) * 1000:.0f} ms"
+        )
+    print(f"{len(ok) / elapsed:.1f} answers/s over {elapsed:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import os
+import tempfile
+import time
+
+from langchain_community.vectorstores import FAISS
+
+from config import BNS_PDF_PATH
+from fakes import FakeEmbeddings
+from ingest import make_splitter
+from pdf_pages import load_pages
+
+# Index size and build time: the original RecursiveCharacterTextSplitter(1000, 200)
+# against the section-aware splitter, on the same parsed PDF.
+#
+#   python bench_chunking.py                       # offline hashing embedder
+#   python bench_chunking.py --configured-embedder --pdf "../Prototype 1/data/ipc.pdf"
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare chunking strategies by index size and build time.")
+    parser.add_argument("--pdf", default=BNS_PDF_PATH)
+    parser.add_argument("--configured-embedder", action="store_true", help="use the embedder from config.py")
+    args = parser.parse_args()
+
+    if args.configured_embedder:
+        from embedding_backend import get_embeddings
+
+        embeddings = get_embeddings()
+    else:
+        embeddings = FakeEmbeddings()
+
+    pages = load_pages(args.pdf)
+    raw_chars = sum(len(page.page_content) for page in pages)
+    print(f"{args.pdf}: {len(pages)} pages, {raw_chars} characters of extracted text")
+    print(f"{'strategy':>10} {'chunks':>7} {'chars':>8} {'max':>6} {'split s':>8} {'build s':>8} {'index KB':>9}")
+
+    for strategy in ("recursive", "section"):
+        start = time.perf_counter()
+        documents = make_splitter(strategy).split_documents(pages)
+        split_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        db = FAISS.from_documents(documents, embeddings)
+        build_seconds = time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db.save_local(tmp)
+            size_kb = directory_size(tmp) / 1024
+
+        chars = sum(len(document.page_content) for document in documents)
+        longest = max(len(document.page_content) for document in documents)
+        print(
+            f"{strategy:>10} {len(documents):>7} {chars:>8} {longest:>6} "
+            f"{split_seconds:>8.2f} {build_seconds:>8.2f} {size_kb:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import time
+
+from batch_embeddings import BatchedOllamaEmbeddings
+from fakes import FakeEmbeddingServer
+
+# Embedding throughput (chunks/sec) against a local fake embedding server,
+# for a grid of batch sizes and worker counts.
+#
+#   python bench_embedding.py --chunks 512 --batch-sizes 1,8,32 --workers 1,2,4,8
+
+
+def int_list(value):
+    return [int(v) for v in value.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched, parallel embedding throughput.")
+    parser.add_argument("--chunks", type=int, default=512)
+    parser.add_argument("--batch-sizes", type=int_list, default=[1, 8, 32, 64])
+    parser.add_argument("--workers", type=int_list, default=[1, 2, 4, 8])
+    parser.add_argument("--capacity", type=int, default=4, help="concurrent requests the fake server accepts")
+    parser.add_argument("--request-latency", type=float, default=0.02)
+    parser.add_argument("--per-text-latency", type=float, default=0.002)
+    args = parser.parse_args()
+
+    texts = [f"Section {i}. Whoever voluntarily causes hurt to any person shall be punished." for i in range(args.chunks)]
+
+    print(f"{'batch':>6} {'workers':>8} {'seconds':>8} {'chunks/s':>9} {'retries':>8} {'503s':>6}")
+    for batch_size in args.batch_sizes:
+        for workers in args.workers:
+            with FakeEmbeddingServer(
+                capacity=args.capacity,
+                request_latency=args.request_latency,
+                per_text_latency=args.per_text_latency,
+            ) as server:
+                embeddings = BatchedOllamaEmbeddings("fake", base_url=server.url, batch_size=batch_size, workers=workers)
+                start = time.perf_counter()
+                vectors = embeddings.embed_documents(texts)
+                elapsed = time.perf_counter() - start
+                assert len(vectors) == len(texts)
+                print(
+                    f"{batch_size:>6} {workers:>8} {elapsed:>8.2f} {len(texts) / elapsed:>9.1f} "
+                    f"{embeddings.stats['retries']:>8} {server.rejected:>6}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from langchain_community.vectorstores import FAISS
+
+from config import BASE_DIR, BNS_PDF_PATH
+from fakes import FakeEmbeddings
+from index_store import save_index
+from ingest import make_splitter
+from pdf_pages import load_pages
+
+# Load time and memory of a fresh process opening the index: LangChain's pickle format
+# (FAISS.load_local) against index.faiss memory-mapped + docstore.sqlite (index_store.load_index).
+# The BNS chunks can be repeated to approximate a larger corpus. "anon MB" is memory private
+# to the process; the rest of RSS is file pages that other workers share through the page cache.
+#
+#   python bench_index_load.py --copies 50 --runs 3
+
+PROBE = """
+import json, sys, time
+
+def memory():
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                fields[name] = int(value.split()[0]) / 1024
+    return fields.get("Rss", 0.0), fields.get("Anonymous", 0.0)
+
+from fakes import FakeEmbeddings
+from langchain_community.vectorstores import FAISS
+from index_store import load_index
+
+index_path, storage = sys.argv[1], sys.argv[2]
+embeddings = FakeEmbeddings()
+rss_before, anon_before = memory()
+start = time.perf_counter()
+if storage == "pickle":
+    db = FAISS.load_local(index_path, embeddings, allow_dangerous_deserialization=True)
+else:
+    db = load_index(index_path, embeddings, "fake", "fake")
+loaded = time.perf_counter() - start
+rss_loaded, anon_loaded = memory()
+start = time.perf_counter()
+for query in ("theft of movable property", "voluntarily causing hurt", "criminal intimidation"):
+    db.similarity_search(query, k=4)
+searched = (time.perf_counter() - start) / 3
+rss_searched, anon_searched = memory()
+print(json.dumps({
+    "load": loaded, "search": searched,
+    "rss": rss_searched - rss_before, "anon": anon_searched - anon_before,
+}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare index load time and memory of the pickle and mmap formats.")
+    parser.add_argument("--pdf", default=BNS_PDF_PATH)
+    parser.add_argument("--copies", type=int, default=20, help="times the chunk set is repeated")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    embeddings = FakeEmbeddings()
+    documents = make_splitter("section").split_documents(load_pages(args.pdf)) * args.copies
+    db = FAISS.from_documents(documents, embeddings)
+    print(f"{len(documents)} chunks of dimension {db.index.d}")
+
+    with tempfile.TemporaryDirectory() as pickle_path, tempfile.TemporaryDirectory() as mmap_path:
+        db.save_local(pickle_path)
+        save_index(mmap_path, db)
+        with open(f"{mmap_path}/embedder.json", "w", encoding="utf-8") as f:
+            json.dump({"backend": "fake", "model": "fake", "dimension": db.index.d}, f)
+
+        print(f"{'format':>7} {'load ms':>8} {'search ms':>10} {'RSS MB':>7} {'anon MB':>8}")
+        for storage, path in (("pickle", pickle_path), ("mmap", mmap_path)):
+            samples = []
+            for _ in range(args.runs):
+                output = subprocess.run(
+                    [sys.executable, "-c", PROBE, path, storage], cwd=BASE_DIR, capture_output=True, text=True,
+                    check=True,
+                ).stdout
+                samples.append(json.loads(output.strip().splitlines()[-1]))
+            median = {name: statistics.median(sample[name] for sample in samples) for name in samples[0]}
+            print(
+                f"{storage:>7} {median['load'] * 1000:>8.1f} {median['search'] * 1000:>10.2f} "
+                f"{median['rss']:>7.1f} {median['anon']:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
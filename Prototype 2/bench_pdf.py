@@ -0,0 +1,62 @@
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from langchain_community.document_loaders import PyPDFLoader
+
+from config import BNS_PDF_PATH, IPC_PDF_PATH, PDF_WORKERS
+from pdf_pages import cached_pages, load_pages, page_furniture
+
+# Pages per second of PDF text extraction: PyPDFLoader(...).load() as ingestion used it,
+# pdf_pages.load_pages with 1 and --workers processes (no cache), and load_pages reading
+# the page cache of an earlier run. "stripped" is the header / footer text removed.
+#
+#   python bench_pdf.py --runs 3 --workers 4
+
+
+def pages_per_second(load, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        pages = load()
+        samples.append(time.perf_counter() - start)
+    return len(pages) / statistics.median(samples), pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF text extraction.")
+    parser.add_argument("pdfs", nargs="*", default=[BNS_PDF_PATH, IPC_PDF_PATH])
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=max(PDF_WORKERS, 2))
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs")
+    print(f"{'pdf':>8} {'pages':>6} {'loader':>22} {'pages/s':>9} {'chars':>9} {'stripped':>9}")
+    for pdf in args.pdfs:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            loaders = [
+                ("PyPDFLoader", lambda: PyPDFLoader(pdf).load()),
+                ("load_pages, 1 worker", lambda: load_pages(pdf, workers=1, cache_dir=None)),
+                (f"load_pages, {args.workers} workers", lambda: load_pages(pdf, args.workers, cache_dir=None)),
+            ]
+            # One parse fills the cache; the cached runs only read it.
+            cached_pages(pdf, args.workers, cache_dir)
+            loaders.append(("load_pages, cached", lambda: load_pages(pdf, cache_dir=cache_dir)))
+
+            raw_chars = None
+            for name, load in loaders:
+                rate, pages = pages_per_second(load, args.runs)
+                chars = sum(len(page.page_content) for page in pages)
+                raw_chars = raw_chars or chars
+                print(
+                    f"{os.path.basename(pdf):>8} {len(pages):>6} {name:>22} {rate:>9.1f} {chars:>9} "
+                    f"{raw_chars - chars:>9}"
+                )
+            furniture = page_furniture([text for _, text in cached_pages(pdf, cache_dir=cache_dir)])
+            print(f"{'':>8} header / footer lines (digits as #): {sorted(furniture) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
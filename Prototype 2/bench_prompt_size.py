@@ -0,0 +1,67 @@
+import argparse
+import os
+import tempfile
+
+from config import BNS_PDF_PATH, SECTION_PROMPT_TOP_K
+from fakes import FakeEmbeddings
+from prompts import ANSWER_TEMPLATE_WITH_SECTION_LIST
+from sections import SectionIndex, format_sections
+from tokens import LLAMA2_CONTEXT_WINDOW, count_tokens
+
+# Prompt-size report: the answer prompt with the full BNS arrangement of sections (what
+# main.py used to send) against the prompt with only the top-k titles for each query.
+# Token counts are estimates (tokens.count_tokens); the retrieved context is left out
+# because it is the same in both cases.
+#
+#   python bench_prompt_size.py            # offline, hashing embedder picks the titles
+#   python bench_prompt_size.py --configured-embedder
+
+QUERIES = [
+    "A man hit my friend with a rod. Tell me BNS Section",
+    "Someone stole my bicycle from outside my house",
+    "My neighbour threatened to kill me if I complain to the police",
+    "A shopkeeper sold me adulterated medicine",
+    "Someone is posting defamatory statements about me online",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare answer prompt sizes before and after section retrieval.")
+    parser.add_argument("--configured-embedder", action="store_true", help="use the embedder from config.py")
+    parser.add_argument("--top-k", type=int, default=SECTION_PROMPT_TOP_K)
+    args = parser.parse_args()
+
+    if args.configured_embedder:
+        from embedding_backend import get_embeddings
+
+        embeddings = get_embeddings()
+    else:
+        embeddings = FakeEmbeddings()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        section_index = SectionIndex.load(BNS_PDF_PATH, os.path.join(tmp, "sections.json"), embeddings, "bench")
+
+    def prompt_tokens(sections, query):
+        return count_tokens(ANSWER_TEMPLATE_WITH_SECTION_LIST.format(
+            sections=format_sections(sections), context="", input=query
+        ))
+
+    print(f"{len(section_index.sections)} sections parsed from {BNS_PDF_PATH}")
+    print(f"{'before':>7} {'after':>6} {'saved':>6}  query")
+    for query in QUERIES:
+        before = prompt_tokens(section_index.sections, query)
+        selected = section_index.top_k(embeddings.embed_query(query), args.top_k)
+        after = prompt_tokens(selected, query)
+        print(f"{before:>7} {after:>6} {before - after:>6}  {query}")
+        print(f"{'':>22}{', '.join(str(section['number']) for section in selected)}")
+
+    before = prompt_tokens(section_index.sections, QUERIES[0])
+    after = prompt_tokens(section_index.top_k(embeddings.embed_query(QUERIES[0]), args.top_k), QUERIES[0])
+    print(
+        f"\nContext window {LLAMA2_CONTEXT_WINDOW} tokens: {LLAMA2_CONTEXT_WINDOW - before} left for context and "
+        f"answer before, {LLAMA2_CONTEXT_WINDOW - after} after."
+    )
+
+
+if __name__ == "__main__":
+    main()
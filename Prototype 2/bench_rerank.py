@@ -0,0 +1,96 @@
+import argparse
+import json
+import statistics
+import time
+
+from langchain_community.vectorstores import FAISS
+
+from bench_retrieval import QUERIES_PATH, percentile
+from config import BNS_PDF_PATH, RERANK_CANDIDATES, RERANK_CUTOFF_MARGIN, RERANKER_MODEL
+from fakes import FakeCrossEncoder, FakeEmbeddings
+from hybrid import HybridRetriever
+from ingest import make_splitter
+from pdf_pages import load_pages
+from rerank import Reranker, load_cross_encoder
+
+# Recall@k against added latency for the re-ranking stage on data/bench_queries.json:
+# hybrid retrieval of k chunks, against hybrid retrieval of RERANK_CANDIDATES chunks re-ranked
+# down to k. The re-ranked pass is run twice; the second one is served from the score cache.
+# "chunks" is the mean number kept after the early cutoff and "cut" the chunks it dropped;
+# each further --margin is run again from the score cache.
+#
+#   python bench_rerank.py --margin 0.5 0.2 0.1              # offline: lexical stand-in re-ranker
+#   python bench_rerank.py --configured --model cross-encoder/ms-marco-MiniLM-L-6-v2
+
+
+def run(queries, search, k):
+    hits = 0
+    latencies = []
+    kept = []
+    for item in queries:
+        start = time.perf_counter()
+        documents = search(item["query"])
+        latencies.append(time.perf_counter() - start)
+        found = {str(document.metadata.get("section")) for document in documents[:k]}
+        hits += bool(found & {str(section) for section in item["sections"]})
+        kept.append(len(documents))
+    return hits / len(queries), latencies, statistics.mean(kept)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the re-ranking stage.")
+    parser.add_argument("--pdf", default=BNS_PDF_PATH)
+    parser.add_argument("--queries", default=QUERIES_PATH)
+    parser.add_argument("-k", type=int, default=4)
+    parser.add_argument("--candidates", type=int, default=RERANK_CANDIDATES)
+    parser.add_argument("--margin", type=float, nargs="+", default=[RERANK_CUTOFF_MARGIN])
+    parser.add_argument(
+        "--configured", action="store_true", help="use the configured embedder and a real cross-encoder"
+    )
+    parser.add_argument("--model", default=RERANKER_MODEL or "cross-encoder/ms-marco-MiniLM-L-6-v2")
+    parser.add_argument("--pair-latency", type=float, default=0.002, help="stand-in re-ranker seconds per pair")
+    args = parser.parse_args()
+
+    if args.configured:
+        from embedding_backend import get_embeddings
+
+        embeddings = get_embeddings()
+        model = load_cross_encoder(args.model)
+    else:
+        embeddings = FakeEmbeddings()
+        model = FakeCrossEncoder(batch_latency=0.005, pair_latency=args.pair_latency)
+
+    with open(args.queries, encoding="utf-8") as f:
+        queries = json.load(f)
+
+    documents = make_splitter("section").split_documents(load_pages(args.pdf))
+    db = FAISS.from_documents(documents, embeddings)
+    hybrid = HybridRetriever(db)
+    reranker = Reranker(model, candidates=args.candidates)
+
+    def hybrid_search(query):
+        return hybrid.search(query, embeddings.embed_query(query), k=args.k)
+
+    def reranked_search(query):
+        candidates = hybrid.search(query, embeddings.embed_query(query), k=reranker.candidates)
+        return [document for document, _ in reranker.rerank(query, candidates, args.k)]
+
+    print(f"{len(documents)} chunks, {args.candidates} candidates re-ranked")
+    print(f"{'retriever':>24} {'recall@' + str(args.k):>9} {'mean ms':>8} {'p95 ms':>7} {'chunks':>7} {'cut':>5}")
+    first, *others = args.margin
+    runs = [("hybrid", hybrid_search, first), (f"reranked, margin {first:g}", reranked_search, first),
+            ("reranked cached", reranked_search, first)]
+    runs += [(f"cached, margin {margin:g}", reranked_search, margin) for margin in others]
+    for name, search, margin in runs:
+        reranker.margin = margin
+        cut = reranker.stats["cut"]
+        recall, latencies, kept = run(queries, search, args.k)
+        print(
+            f"{name:>24} {recall:>9.2f} {statistics.mean(latencies) * 1000:>8.2f} "
+            f"{percentile(latencies, 0.95) * 1000:>7.2f} {kept:>7.2f} {reranker.stats['cut'] - cut:>5}"
+        )
+    print(f"re-ranker: {reranker.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import json
+import os
+import statistics
+import time
+
+from langchain_community.vectorstores import FAISS
+
+from config import BASE_DIR, BNS_PDF_PATH
+from fakes import FakeEmbeddings
+from hybrid import HybridRetriever
+from ingest import make_splitter
+from pdf_pages import load_pages
+
+# Retrieval latency and recall@k on data/bench_queries.json: FAISS alone against the
+# hybrid retriever (section-number lookup, then BM25 + FAISS fusion). Queries are not
+# rephrased, so no LLM is needed; the raw query stands in for the rephrased one.
+#
+#   python bench_retrieval.py                      # offline hashing embedder
+#   python bench_retrieval.py --configured-embedder -k 8
+
+QUERIES_PATH = os.path.join(BASE_DIR, "data", "bench_queries.json")
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def vector_search(db, hybrid, embeddings, query, k):
+    return db.similarity_search_by_vector(embeddings.embed_query(query), k=k)
+
+
+def hybrid_search(db, hybrid, embeddings, query, k):
+    documents = hybrid.lookup_section(query)
+    if documents:
+        return documents[:k]
+    return hybrid.search(query, embeddings.embed_query(query), k=k)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare FAISS-only and hybrid retrieval.")
+    parser.add_argument("--pdf", default=BNS_PDF_PATH)
+    parser.add_argument("--queries", default=QUERIES_PATH)
+    parser.add_argument("-k", type=int, default=4)
+    parser.add_argument("--configured-embedder", action="store_true", help="use the embedder from config.py")
+    args = parser.parse_args()
+
+    if args.configured_embedder:
+        from embedding_backend import get_embeddings
+
+        embeddings = get_embeddings()
+    else:
+        embeddings = FakeEmbeddings()
+
+    with open(args.queries, encoding="utf-8") as f:
+        queries = json.load(f)
+
+    documents = make_splitter("section").split_documents(load_pages(args.pdf))
+    db = FAISS.from_documents(documents, embeddings)
+    start = time.perf_counter()
+    hybrid = HybridRetriever(db)
+    print(f"{len(documents)} chunks, {len(hybrid.sections)} sections, BM25 built in {time.perf_counter() - start:.3f} s")
+    print(f"{'retriever':>10} {'recall@' + str(args.k):>9} {'mean ms':>8} {'p95 ms':>7}")
+
+    for name, search in (("faiss", vector_search), ("hybrid", hybrid_search)):
+        hits = 0
+        latencies = []
+        for item in queries:
+            start = time.perf_counter()
+            results = search(db, hybrid, embeddings, item["query"], args.k)
+            latencies.append(time.perf_counter() - start)
+            found = {str(document.metadata.get("section")) for document in results}
+            hits += bool(found & {str(section) for section in item["sections"]})
+        print(
+            f"{name:>10} {hits / len(queries):>9.2f} {statistics.mean(latencies) * 1000:>8.2f} "
+            f"{percentile(latencies, 0.95) * 1000:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from config import BASE_DIR
+from fakes import build_fake_index
+
+# Many concurrent Streamlit sessions against one process: each session either builds its
+# own LegalAidService (what final.py did with st.session_state) or gets the process-wide
+# one from st.cache_resource (what it does now). Reports services built, private memory
+# and time from session start to the first answer token. Runs offline with the fake
+# embedder and LLM; each mode runs in a fresh interpreter.
+#
+#   python bench_sessions.py --sessions 20
+
+QUERIES_PATH = os.path.join(BASE_DIR, "data", "bench_queries.json")
+
+PROBE = """
+import json, logging, statistics, sys, threading, time
+import streamlit as st
+from fakes import FakeEmbeddings, FakeLLM
+from service import LegalAidService
+
+logging.disable(logging.WARNING)
+
+def anonymous_mb():
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Anonymous:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+index_path, mode, sessions, queries_path, prompt_latency, token_latency = sys.argv[1:]
+with open(queries_path, encoding="utf-8") as f:
+    queries = [item["query"] for item in json.load(f)]
+built = []
+
+def build_service():
+    built.append(1)
+    return LegalAidService(
+        index_path, llm=FakeLLM(prompt_latency=float(prompt_latency), token_latency=float(token_latency)),
+        embeddings=FakeEmbeddings(), cache_path=None, rephrase_memo_path=None, log=lambda *args: None,
+    ).ready()
+
+shared_service = st.cache_resource(build_service)
+get_service = shared_service if mode == "shared" else build_service
+barrier = threading.Barrier(int(sessions))
+first_answer = []
+baseline = anonymous_mb()
+
+def session(number):
+    barrier.wait()
+    start = time.perf_counter()
+    result = get_service().stream(queries[number % len(queries)])
+    stream = result["stream"]
+    next(stream)
+    first_answer.append(time.perf_counter() - start)
+    for _ in stream:
+        pass
+
+threads = [threading.Thread(target=session, args=(number,)) for number in range(int(sessions))]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+first_answer.sort()
+print(json.dumps({
+    "built": len(built), "memory": anonymous_mb() - baseline,
+    "p50": statistics.median(first_answer), "max": first_answer[-1],
+}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test: per-session services against one shared service.")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--prompt-latency", type=float, default=0.05, help="fake LLM delay before the first token")
+    parser.add_argument("--token-latency", type=float, default=0.005)
+    parser.add_argument("--queries", default=QUERIES_PATH)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = build_fake_index(os.path.join(tmp, "faiss_index"))
+
+        print(f"{args.sessions} concurrent sessions")
+        print(f"{'mode':>8} {'services':>9} {'memory MB':>10} {'first answer p50 ms':>20} {'max ms':>8}")
+        for mode in ("session", "shared"):
+            output = subprocess.run(
+                [
+                    sys.executable, "-c", PROBE, index_path, mode, str(args.sessions), args.queries,
+                    str(args.prompt_latency), str(args.token_latency),
+                ],
+                cwd=BASE_DIR, capture_output=True, text=True, check=True,
+            ).stdout
+            report = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{mode:>8} {report['built']:>9} {report['memory']:>10.1f} "
+                f"{report['p50'] * 1000:>20.0f} {report['max'] * 1000:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
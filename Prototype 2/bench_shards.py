@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from config import BASE_DIR, BNS_PDF_PATH, EMBEDDING_BACKEND, EMBEDDING_MODEL, IPC_PDF_PATH
+from fakes import FakeEmbeddings
+from ingest import ingest, ingest_shards
+
+# Startup cost and search latency of one combined BNS + IPC index against per-act shards
+# (shards.py), each measured in a fresh process with the offline embedder. "start" loads what
+# a BNS question needs (index, BM25, section table); "+ipc" is the memory after a question
+# naming the IPC has loaded that shard too; "fan-out" searches a question naming both acts.
+#
+#   python bench_shards.py --runs 3
+
+PROBE = """
+import json, os, sys, time
+os.environ["LEGAL_AID_TRACE_LOG"] = ""
+
+def anonymous_mb():
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Anonymous:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+from fakes import FakeEmbeddings, FakeLLM
+from pipeline import retrieve
+from service import LegalAidService
+
+def search(query):
+    start = time.perf_counter()
+    retrieve(query, service.rephraser, service.db, skip_rephrase=True, hybrid=service.hybrid)
+    return time.perf_counter() - start
+
+before = anonymous_mb()
+start = time.perf_counter()
+service = LegalAidService(sys.argv[1], llm=FakeLLM(), embeddings=FakeEmbeddings(), cache_path=None,
+                          rephrase_memo_path=None, log=lambda *args: None)
+service.hybrid, service.db, service.rephraser
+started = time.perf_counter() - start
+bns = search("punishment for voluntarily causing grievous hurt")
+start_mb = anonymous_mb() - before
+ipc = search("punishment for voluntarily causing grievous hurt under the IPC")
+ipc_mb = anonymous_mb() - before
+both = search("voluntarily causing grievous hurt in the BNS and the IPC")
+print(json.dumps({"start": started, "start_mb": start_mb, "ipc_mb": ipc_mb, "bns": bns, "ipc": ipc, "both": both}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare a combined index with per-act shards.")
+    parser.add_argument("--bns", default=BNS_PDF_PATH)
+    parser.add_argument("--ipc", default=IPC_PDF_PATH)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    sources = {"bns": args.bns, "ipc": args.ipc}
+    with tempfile.TemporaryDirectory() as tmp:
+        combined = os.path.join(tmp, "combined")
+        sharded = os.path.join(tmp, "sharded")
+        ingest(sources, FakeEmbeddings(), combined, backend=EMBEDDING_BACKEND, model=EMBEDDING_MODEL)
+        ingest_shards(sources, FakeEmbeddings(), sharded, backend=EMBEDDING_BACKEND, model=EMBEDDING_MODEL)
+
+        print(f"{'layout':>9} {'start ms':>9} {'start MB':>9} {'+ipc MB':>8} {'bns ms':>7} {'ipc ms':>7} "
+              f"{'fan-out ms':>11}")
+        for layout, path in (("combined", combined), ("sharded", sharded)):
+            samples = []
+            for _ in range(args.runs):
+                output = subprocess.run(
+                    [sys.executable, "-c", PROBE, path], cwd=BASE_DIR, capture_output=True, text=True, check=True,
+                ).stdout
+                samples.append(json.loads(output.strip().splitlines()[-1]))
+            median = {name: statistics.median(sample[name] for sample in samples) for name in samples[0]}
+            print(
+                f"{layout:>9} {median['start'] * 1000:>9.1f} {median['start_mb']:>9.1f} {median['ipc_mb']:>8.1f} "
+                f"{median['bns'] * 1000:>7.2f} {median['ipc'] * 1000:>7.2f} {median['both'] * 1000:>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
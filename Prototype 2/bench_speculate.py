@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from bench_suite import QUERIES_PATH, percentile
+from fakes import FakeEmbeddings, FakeLLM, build_fake_index
+from pipeline import retrieve
+from rephrase import INFORMAL_WORDS, STOP_WORDS, WORD_PATTERN
+from service import LegalAidService
+from speculate import Speculator
+
+# Sequential against speculative retrieval (speculate.py) on the bench queries, with the
+# hashing embedder and a stand-in rephraser that takes --rephrase-latency seconds and drops
+# conversational and stop words (as the LLM's formal rewrite mostly does). "ready ms" is
+# the time until retrieve() returns the chunks for the prompt; "reused" is
+# the share of queries whose raw results were kept without the rephrased search.
+#
+#   python bench_speculate.py --rephrase-latency 0.5 --embed-latency 0.02 --overlap 0.5 0.75 1
+
+
+class DelayedRephraser:
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def needs_llm(self, query, skip=None):
+        return True
+
+    def rephrase(self, query, skip=None):
+        time.sleep(self.latency)
+        words = [word for word in WORD_PATTERN.findall(query.lower()) if word not in INFORMAL_WORDS | STOP_WORDS]
+        return " ".join(words), "llm"
+
+
+def run(service, rephraser, queries, k, speculator):
+    ready = []
+    hits = 0
+    for item in queries:
+        start = time.perf_counter()
+        result = retrieve(
+            item["query"], rephraser, service.db, k=k, section_index=service.section_index, hybrid=service.hybrid,
+            speculator=speculator,
+        )
+        ready.append(time.perf_counter() - start)
+        found = {str(document.metadata.get("section")) for document in result["documents"][:k]}
+        hits += bool(found & {str(section) for section in item["sections"]})
+    return ready, hits / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sequential and speculative retrieval.")
+    parser.add_argument("--queries", default=QUERIES_PATH)
+    parser.add_argument("-k", type=int, default=4)
+    parser.add_argument("--rephrase-latency", type=float, default=0.2)
+    parser.add_argument("--embed-latency", type=float, default=0.02)
+    parser.add_argument("--overlap", type=float, nargs="+", default=[0.5, 0.75, 1.0])
+    args = parser.parse_args()
+
+    with open(args.queries, encoding="utf-8") as f:
+        queries = json.load(f)
+    rephraser = DelayedRephraser(args.rephrase_latency)
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = build_fake_index(os.path.join(tmp, "faiss_index"))
+        service = LegalAidService(
+            index_path, llm=FakeLLM(), embeddings=FakeEmbeddings(latency=args.embed_latency), cache_path=None,
+            rephrase_memo_path=None, log=lambda *args: None,
+        ).ready()
+
+        print(f"{'mode':>18} {'ready p50 ms':>13} {'ready p95 ms':>13} {'recall@' + str(args.k):>9} {'reused':>7}")
+        modes = [("sequential", None)] + [
+            (f"speculative {threshold:g}", Speculator(threshold=threshold)) for threshold in args.overlap
+        ]
+        for name, speculator in modes:
+            ready, recall = run(service, rephraser, queries, args.k, speculator)
+            reused = speculator.stats["reused"] / speculator.stats["speculated"] if speculator else 0.0
+            print(
+                f"{name:>18} {statistics.median(ready) * 1000:>13.1f} {percentile(ready, 0.95) * 1000:>13.1f} "
+                f"{recall:>9.3f} {reused:>7.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from config import BASE_DIR
+
+# Startup cost of a fresh process: how long `import main` takes and how long until
+# main.service.ready() has loaded the embedder, index, LLM client and chains.
+# Each run is a new interpreter so nothing is shared between measurements.
+#
+#   python bench_startup.py --runs 5
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+main.service.ready()
+ready = time.perf_counter()
+print(json.dumps({"import": imported - start, "ready": ready - start}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time and time-to-ready of main.py.")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    samples = {"import": [], "ready": []}
+    for run in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE], cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        timing = json.loads(output.strip().splitlines()[-1])
+        for name, value in timing.items():
+            samples[name].append(value)
+        print(f"run {run + 1}: import {timing['import']:.2f}s, ready {timing['ready']:.2f}s")
+
+    for name, values in samples.items():
+        print(f"{name:>6}: median {statistics.median(values):.2f}s, min {min(values):.2f}s, max {max(values):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from config import BASE_DIR, EMBEDDING_BACKEND, EMBEDDING_MODEL
+from fakes import FakeEmbeddings, FakeLLM, build_fake_index
+from index_store import load_index
+from pipeline import retrieve, run_pipeline
+from service import LegalAidService
+
+# Offline regression benchmark for the whole RAG path. Uses the hashing embedder and a stub
+# LLM (fakes.py), the fixed queries and expected sections in data/bench_queries.json, and
+# reports:
+#   build_s          ingest bns.pdf into a fresh index
+#   load_ms          open the saved index (median)
+#   retrieve_p50/p95/p99_ms   rephrase-free retrieval (hybrid search + section titles)
+#   recall@k         share of queries with an expected section among the top k chunks
+#   overhead_p50/p95_ms       run_pipeline end to end minus its rephrase, embed and generate
+#                    spans, i.e. the pipeline's own cost excluding model time
+#
+# --llm-latency/--embed-latency slow the stand-ins down to Ollama-like speeds, to check that
+# overhead stays flat when the models are slow.
+#
+#   python bench_suite.py --save-baseline bench_baseline.json
+#   python bench_suite.py --baseline bench_baseline.json      # exit 1 on a regression
+
+QUERIES_PATH = os.path.join(BASE_DIR, "data", "bench_queries.json")
+
+# Latencies may grow by this fraction and recall may drop by RECALL_TOLERANCE before a
+# comparison with the baseline fails.
+LATENCY_TOLERANCE = 0.25
+RECALL_TOLERANCE = 0.02
+
+MODEL_STAGES = ("rephrase", "embed", "generate")
+
+
+class FixedRephraser:
+    # The rephrase LLM is a model cost; retrieval is measured on the raw query.
+
+    def rephrase(self, query, skip=None):
+        return query, "skipped"
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def milliseconds(values, fraction):
+    return percentile(values, fraction) * 1000
+
+
+def run_suite(queries, k, repeats, llm_latency=0.0, embed_latency=0.0):
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = os.path.join(tmp, "faiss_index")
+        start = time.perf_counter()
+        build_fake_index(index_path)
+        report["build_s"] = time.perf_counter() - start
+
+        load_times = []
+        for _ in range(5):
+            start = time.perf_counter()
+            load_index(index_path, FakeEmbeddings(), EMBEDDING_BACKEND, EMBEDDING_MODEL)
+            load_times.append(time.perf_counter() - start)
+        report["load_ms"] = statistics.median(load_times) * 1000
+
+        service = LegalAidService(
+            index_path, llm=FakeLLM(token_latency=llm_latency), embeddings=FakeEmbeddings(latency=embed_latency),
+            cache_path=None, rephrase_memo_path=None,
+            log=lambda *args: None,
+        ).ready()
+        rephraser = FixedRephraser()
+
+        latencies = []
+        hits = 0
+        for repeat in range(repeats):
+            for item in queries:
+                start = time.perf_counter()
+                result = retrieve(
+                    item["query"], rephraser, service.db, k=k, section_index=service.section_index,
+                    hybrid=service.hybrid,
+                )
+                latencies.append(time.perf_counter() - start)
+                if repeat == 0:
+                    found = {str(document.metadata.get("section")) for document in result["documents"][:k]}
+                    hits += bool(found & {str(section) for section in item["sections"]})
+        report["retrieve_p50_ms"] = milliseconds(latencies, 0.50)
+        report["retrieve_p95_ms"] = milliseconds(latencies, 0.95)
+        report["retrieve_p99_ms"] = milliseconds(latencies, 0.99)
+        report[f"recall@{k}"] = hits / len(queries)
+
+        overheads = []
+        for _ in range(repeats):
+            for item in queries:
+                timings = run_pipeline(
+                    item["query"], service.rephraser, service.db, service.document_chain, k=k,
+                    section_index=service.section_index, hybrid=service.hybrid, assembler=service.assembler,
+                )["timings"]
+                overheads.append(timings["total"] - sum(timings.get(stage, 0.0) for stage in MODEL_STAGES))
+        report["overhead_p50_ms"] = milliseconds(overheads, 0.50)
+        report["overhead_p95_ms"] = milliseconds(overheads, 0.95)
+    return report
+
+
+def regressions(report, baseline):
+    failed = []
+    for name, value in report.items():
+        if name not in baseline:
+            continue
+        if name.startswith("recall@"):
+            if value < baseline[name] - RECALL_TOLERANCE:
+                failed.append(f"{name} {value:.2f} < baseline {baseline[name]:.2f}")
+        elif value > baseline[name] * (1 + LATENCY_TOLERANCE):
+            failed.append(f"{name} {value:.2f} > baseline {baseline[name]:.2f} + {LATENCY_TOLERANCE:.0%}")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline RAG benchmark suite.")
+    parser.add_argument("--queries", default=QUERIES_PATH)
+    parser.add_argument("-k", type=int, default=4)
+    parser.add_argument("--repeats", type=int, default=5, help="passes over the query set for latency figures")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="seconds per generated word")
+    parser.add_argument("--embed-latency", type=float, default=0.0, help="seconds per embedding call")
+    parser.add_argument("--baseline", help="JSON report to compare against; exits 1 on a regression")
+    parser.add_argument("--save-baseline", help="write this run's report to the given path")
+    args = parser.parse_args()
+
+    with open(args.queries, encoding="utf-8") as f:
+        queries = json.load(f)
+
+    report = run_suite(queries, args.k, args.repeats, args.llm_latency, args.embed_latency)
+    for name, value in report.items():
+        print(f"{name:>18}: {value:.3f}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            failed = regressions(report, json.load(f))
+        for failure in failed:
+            print(f"REGRESSION: {failure}")
+        if failed:
+            sys.exit(1)
+        print("No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
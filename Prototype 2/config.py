@@ -0,0 +1,119 @@
+import os
+
+# All paths and model choices live here so main.py, final.py and the command-line
+# tools agree on them. Every value can be overridden through the environment.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+FAISS_INDEX_PATH = os.environ.get("LEGAL_AID_INDEX_PATH", os.path.join(BASE_DIR, "faiss_index"))
+BNS_PDF_PATH = os.environ.get("LEGAL_AID_BNS_PDF", os.path.join(BASE_DIR, "data", "bns.pdf"))
+IPC_PDF_PATH = os.environ.get(
+    "LEGAL_AID_IPC_PDF", os.path.join(BASE_DIR, os.pardir, "Prototype 1", "data", "ipc.pdf")
+)
+
+# Acts indexed by default. More can be added with `python ingest.py --add ipc=<path>`;
+# the ingestion manifest remembers them for later runs.
+STATUTE_PDFS = {"bns": BNS_PDF_PATH}
+
+# With a sharded index (`python ingest.py --shards`), the acts searched when a question names
+# none; "*" searches every shard. Other shards are loaded the first time a question names them.
+DEFAULT_ACTS = [act.strip() for act in os.environ.get("LEGAL_AID_DEFAULT_ACTS", "bns").split(",") if act.strip()]
+
+# PDF pages are parsed by this many processes, and their text cached per PDF (pdf_pages.py).
+PDF_WORKERS = int(os.environ.get("LEGAL_AID_PDF_WORKERS", str(os.cpu_count() or 1)))
+PAGE_CACHE_DIR = os.environ.get("LEGAL_AID_PAGE_CACHE", os.path.join(BASE_DIR, "page_cache"))
+
+# "section" makes one chunk per statute section (sub-sections grouped up to
+# SECTION_CHUNK_MAX_CHARS); "recursive" is the original fixed-size, overlapping split.
+CHUNKING_STRATEGY = os.environ.get("LEGAL_AID_CHUNKING", "section")
+SECTION_CHUNK_MAX_CHARS = 2000
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+
+# FAISS index served for search (see index_types.py): "flat" (exact), "hnsw", "ivf-flat",
+# "ivf-pq", "sq-fp16" or "sq8". Chosen when the index is built; `python tune_index.py`
+# compares them on the current corpus. An nlist or pq_m of 0 is sized from the corpus.
+FAISS_INDEX_TYPE = os.environ.get("LEGAL_AID_INDEX_TYPE", "flat")
+FAISS_NLIST = int(os.environ.get("LEGAL_AID_INDEX_NLIST", "0"))
+FAISS_NPROBE = int(os.environ.get("LEGAL_AID_INDEX_NPROBE", "8"))
+FAISS_PQ_M = int(os.environ.get("LEGAL_AID_INDEX_PQ_M", "0"))
+FAISS_HNSW_M = int(os.environ.get("LEGAL_AID_INDEX_HNSW_M", "32"))
+FAISS_EF_SEARCH = int(os.environ.get("LEGAL_AID_INDEX_EF_SEARCH", "64"))
+
+OLLAMA_BASE_URL = os.environ.get("LEGAL_AID_OLLAMA_URL", "http://localhost:11434")
+LLM_MODEL = os.environ.get("LEGAL_AID_LLM_MODEL", "llama2:7b")
+
+# "huggingface" runs a small sentence-embedding model locally on CPU,
+# "ollama" sends texts to the Ollama server (e.g. nomic-embed-text, or the old llama2:7b).
+EMBEDDING_BACKEND = os.environ.get("LEGAL_AID_EMBEDDING_BACKEND", "huggingface")
+EMBEDDING_MODEL = os.environ.get("LEGAL_AID_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+
+# Texts per embedding call and, for the Ollama backend, concurrent requests during ingestion.
+EMBEDDING_BATCH_SIZE = int(os.environ.get("LEGAL_AID_EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_WORKERS = int(os.environ.get("LEGAL_AID_EMBEDDING_WORKERS", "4"))
+
+# Answer cache: exact match on normalised text, then cosine similarity of the rephrased
+# query embedding. Entries expire after the TTL and are dropped when the index is rebuilt.
+# The file is written every ANSWER_CACHE_FLUSH new answers and at exit.
+ANSWER_CACHE_PATH = os.environ.get("LEGAL_AID_ANSWER_CACHE", os.path.join(BASE_DIR, "answer_cache.json"))
+ANSWER_CACHE_SIZE = 512
+ANSWER_CACHE_TTL = 7 * 24 * 3600
+ANSWER_CACHE_FLUSH = 16
+SEMANTIC_CACHE_THRESHOLD = 0.95
+
+# Rephrase memo and the fast path that skips rephrasing for queries already written in
+# statute language (share of content words found in the BNS vocabulary). The memo is
+# written every REPHRASE_MEMO_FLUSH new rephrases and at exit.
+REPHRASE_MEMO_PATH = os.environ.get("LEGAL_AID_REPHRASE_MEMO", os.path.join(BASE_DIR, "rephrase_memo.json"))
+REPHRASE_MEMO_SIZE = 4096
+REPHRASE_MEMO_TTL = 30 * 24 * 3600
+REPHRASE_MEMO_FLUSH = 32
+FORMAL_QUERY_THRESHOLD = 0.6
+
+# IPC -> BNS section table built by `python crossref.py --build`.
+CROSSREF_PATH = os.environ.get("LEGAL_AID_CROSSREF", os.path.join(BASE_DIR, "data", "ipc_bns.json"))
+
+# Number of BNS section titles, closest to the query, injected into the answer prompt.
+SECTION_PROMPT_TOP_K = 8
+
+# Answer prompt context (context.py): chunks retrieved as candidates, and the estimated tokens
+# they may take up. The budget is lowered further if the prompt plus ANSWER_TOKEN_RESERVE tokens
+# for the answer would not fit the LLM's context window.
+CONTEXT_CANDIDATES = int(os.environ.get("LEGAL_AID_CONTEXT_CANDIDATES", "8"))
+CONTEXT_TOKEN_BUDGET = int(os.environ.get("LEGAL_AID_CONTEXT_TOKEN_BUDGET", "1536"))
+ANSWER_TOKEN_RESERVE = 512
+
+# Optional cross-encoder re-ranking (rerank.py), off while RERANKER_MODEL is empty; e.g.
+# cross-encoder/ms-marco-MiniLM-L-6-v2 runs on CPU. Chunks fetched for re-ranking, the score
+# below the best chunk at which the rest are cut, and cached (query, chunk) scores.
+RERANKER_MODEL = os.environ.get("LEGAL_AID_RERANKER_MODEL", "")
+RERANK_CANDIDATES = int(os.environ.get("LEGAL_AID_RERANK_CANDIDATES", "20"))
+RERANK_CUTOFF_MARGIN = float(os.environ.get("LEGAL_AID_RERANK_CUTOFF_MARGIN", "0.5"))
+RERANK_CACHE_SIZE = 4096
+
+# Speculative retrieval (speculate.py), off unless LEGAL_AID_SPECULATIVE_RETRIEVAL=1: the raw
+# question is searched while the LLM rephrases it, and those results are reused when the
+# rephrased query's nearest chunks overlap them by at least SPECULATIVE_OVERLAP.
+SPECULATIVE_RETRIEVAL = os.environ.get("LEGAL_AID_SPECULATIVE_RETRIEVAL", "0") == "1"
+SPECULATIVE_OVERLAP = float(os.environ.get("LEGAL_AID_SPECULATIVE_OVERLAP", "0.75"))
+SPECULATIVE_WORKERS = 4
+
+# HTTP API (api.py): requests allowed to run the pipeline at once (each holds the LLM for a
+# rephrase and/or an answer), requests allowed to wait for a slot, and how long they wait
+# before getting 429.
+API_MAX_IN_FLIGHT = int(os.environ.get("LEGAL_AID_API_MAX_IN_FLIGHT", "2"))
+API_MAX_QUEUE = int(os.environ.get("LEGAL_AID_API_MAX_QUEUE", "16"))
+API_QUEUE_TIMEOUT = float(os.environ.get("LEGAL_AID_API_QUEUE_TIMEOUT", "30"))
+
+# Batch classification (batch.py): queries embedded and searched together, and concurrent
+# LLM calls (rephrase and answer) while a batch is processed.
+BATCH_SIZE = int(os.environ.get("LEGAL_AID_BATCH_SIZE", "64"))
+BATCH_LLM_WORKERS = int(os.environ.get("LEGAL_AID_BATCH_LLM_WORKERS", "2"))
+
+# Tracing (tracing.py): one JSON line per answer with its per-stage spans, written only when
+# LEGAL_AID_TRACE_LOG is set (e.g. to traces.jsonl) and rotated at TRACE_LOG_MAX_BYTES, and an
+# optional port for a Prometheus /metrics endpoint in the Streamlit process (api.py serves
+# /metrics itself).
+TRACE_LOG_PATH = os.environ.get("LEGAL_AID_TRACE_LOG", "")
+TRACE_LOG_MAX_BYTES = 16 * 1024 * 1024
+TRACE_LOG_BACKUPS = 3
+METRICS_PORT = int(os.environ.get("LEGAL_AID_METRICS_PORT", "0"))
@@ -0,0 +1,75 @@
+from langchain_core.documents import Document
+
+from config import ANSWER_TOKEN_RESERVE, CHUNK_OVERLAP, CONTEXT_CANDIDATES, CONTEXT_TOKEN_BUDGET
+from tokens import LLAMA2_CONTEXT_WINDOW, count_tokens
+
+# Picks the chunks that go into the answer prompt.
+#
+# Retrieval returns CONTEXT_CANDIDATES chunks, best first. They are taken in that order
+# while their estimated tokens fit the budget; a chunk that does not fit is passed over in
+# favour of smaller, lower-ranked ones. The budget is CONTEXT_TOKEN_BUDGET, capped so that
+# the answer template, the section list, the question, the context and ANSWER_TOKEN_RESERVE
+# tokens for the answer all fit llama2's context window, then reduced by the tokens the
+# section list and question actually use. So the prompt size, and with it the prefill time,
+# has a fixed upper bound whatever the retriever returns.
+#
+# The recursive splitter repeats up to CHUNK_OVERLAP characters between neighbouring chunks.
+# When two picked chunks share such a region it is cut from the later one, and a chunk whose
+# text is already contained in a picked one is dropped, so no text is paid for twice.
+
+# Shorter shared edges are left alone: they are more likely a common phrase than an overlap.
+MIN_OVERLAP_CHARS = 20
+
+
+def shared_edge(first, second, limit=CHUNK_OVERLAP):
+    # Length of the longest end of `first` that `second` starts with.
+    if second[:MIN_OVERLAP_CHARS] not in first[-limit:]:
+        return 0
+    for size in range(min(limit, len(first), len(second)), MIN_OVERLAP_CHARS - 1, -1):
+        if first.endswith(second[:size]):
+            return size
+    return 0
+
+
+def trim_overlap(text, picked):
+    for other in picked:
+        if text in other:
+            return ""
+        head = shared_edge(other, text)
+        if head:
+            text = text[head:]
+        tail = shared_edge(text, other)
+        if tail:
+            text = text[:-tail]
+    return text.strip()
+
+
+def window_budget(answer_template, window=LLAMA2_CONTEXT_WINDOW, reserve=ANSWER_TOKEN_RESERVE):
+    return window - reserve - count_tokens(answer_template)
+
+
+class ContextAssembler:
+
+    def __init__(self, answer_template, budget=CONTEXT_TOKEN_BUDGET, candidates=CONTEXT_CANDIDATES):
+        self.budget = min(budget, window_budget(answer_template))
+        self.candidates = candidates
+
+    def assemble(self, documents, query="", sections=""):
+        # Returns (documents, tokens used). Trimmed chunks are copies; the docstore's are untouched.
+        remaining = self.budget - count_tokens(query) - count_tokens(sections)
+        picked = []
+        texts = []
+        used = 0
+        for document in documents:
+            text = trim_overlap(document.page_content, texts)
+            if not text:
+                continue
+            tokens = count_tokens(text)
+            if used + tokens > remaining:
+                continue
+            if text != document.page_content:
+                document = Document(page_content=text, metadata=dict(document.metadata, trimmed=True))
+            picked.append(document)
+            texts.append(text)
+            used += tokens
+        return picked, used
@@ -0,0 +1,240 @@
+import argparse
+import json
+import math
+import re
+import time
+from collections import Counter
+
+import numpy as np
+from pypdf import PdfReader
+
+from config import BNS_PDF_PATH, CROSSREF_PATH, IPC_PDF_PATH
+from hybrid import bm25_tokens
+from ingest import make_splitter
+from pdf_pages import file_sha256, load_pages
+from sections import parse_sections
+
+# IPC -> BNS section correspondence, built offline from the two PDFs and answered from a dict.
+#
+# Build (`python crossref.py --build`, ~30 s): every section of each act is split out with the
+# section-aware splitter, and each IPC section is matched to the BNS section with the most
+# similar title and text (TF-IDF cosine; the title weighs TITLE_WEIGHT, the rest the body). The
+# IPC's editorial COMMENTS and CLASSIFICATION blocks are dropped first, and its titles are taken
+# from its own table of sections, which the section headings mangle ("deli every"). A match is
+# kept only if the combined score reaches MIN_SCORE and the titles and the texts each match on
+# their own (MIN_TITLE_SCORE, MIN_TEXT_SCORE; a near-identical title, SAME_TITLE_SCORE, is
+# enough on its own, as a short punishment section shares few words with the BNS section that
+# also defines the offence). Otherwise the section is left unresolved rather than guessed.
+# Generic titles ("Punishment") and IPC definitions, which the BNS folds into section 2,
+# mostly end up unresolved. The table is written to data/ipc_bns.json.
+#
+# Lookup: CrossReference.lookup("IPC 323 in BNS?") finds the cited IPC section with a regex and
+# answers from the table. Questions citing a BNS section, unresolved or unknown IPC sections
+# return None and go through the normal path instead.
+
+TITLE_WEIGHT = 0.7
+MIN_SCORE = 0.3
+MIN_TITLE_SCORE = 0.1
+MIN_TEXT_SCORE = 0.2
+SAME_TITLE_SCORE = 0.75
+
+ACT_LABELS = {"ipc": "IPC", "bns": "BNS"}
+IPC_NAMES = r"ipc|i\.p\.c\.?|indian penal code"
+NUMBER = r"(\d{1,3}[a-z]{0,2})"
+SECTION_WORD = r"(?:section|sec\.?|s\.)"
+IPC_CITATIONS = (
+    re.compile(rf"\b{SECTION_WORD}\s*{NUMBER}\s*(?:of\s+(?:the\s+)?)?(?:{IPC_NAMES})\b", re.IGNORECASE),
+    re.compile(rf"\b(?:{IPC_NAMES})\s*(?:,\s*)?{SECTION_WORD}?\s*{NUMBER}\b", re.IGNORECASE),
+    re.compile(rf"\b{NUMBER}\s+(?:{IPC_NAMES})\b", re.IGNORECASE),
+)
+
+# Commentary the IPC edition adds after the text of a section.
+IPC_EDITORIAL = re.compile(r"COMMENTS|CLASSIFICATION OF")
+TABLE_ENTRY = re.compile(r"^(\d{1,3}[A-Z]{0,2})\s*\.?\s+(\S.*)$")
+# The IPC's curly quotes come out of the PDF as "―" and "‖".
+MISMAPPED_QUOTES = re.compile(r"[―‖]")
+
+
+def clean_text(text):
+    return " ".join(MISMAPPED_QUOTES.sub('"', text).split())
+
+
+def clean_title(title):
+    return clean_text(title).strip(' "[].:-')
+
+
+def section_key(number):
+    match = re.match(r"(\d+)(.*)", number)
+    return int(match.group(1)), match.group(2)
+
+
+def parse_section_table(pdf_path, max_pages=30):
+    # The IPC edition lists its sections as "29A. Electronic record" under "Sections Particulars".
+    lines = []
+    for page in PdfReader(pdf_path).pages[:max_pages]:
+        lines.extend(page.extract_text().splitlines())
+    titles = {}
+    started = False
+    number = None
+    for raw in lines:
+        line = " ".join(raw.split())
+        if not line:
+            continue
+        if not started:
+            started = line.lower().startswith("sections particulars")
+            continue
+        if line.upper().startswith("CHAPTER"):
+            break
+        if line.isdigit():
+            continue
+        match = TABLE_ENTRY.match(line)
+        if match:
+            number = match.group(1)
+            titles[number] = match.group(2).rstrip(" :-.")
+        elif number is not None:
+            titles[number] += " " + line
+    return titles
+
+
+def act_sections(pdf_path, editorial=None):
+    sections = {}
+    # Sections whose editorial block has started; their remaining chunks are all commentary.
+    annotated = set()
+    for chunk in make_splitter("section").split_documents(load_pages(pdf_path)):
+        number = chunk.metadata.get("section")
+        if number is None or number in annotated:
+            continue
+        text = chunk.page_content
+        if editorial is not None and editorial.search(text):
+            text = editorial.split(text)[0]
+            annotated.add(number)
+        entry = sections.setdefault(
+            str(number).upper(), {"title": clean_title(chunk.metadata.get("title") or ""), "text": ""}
+        )
+        entry["text"] += " " + clean_text(text)
+    return sections
+
+
+def tfidf(texts):
+    counts = [Counter(bm25_tokens(text)) for text in texts]
+    document_frequency = Counter(word for count in counts for word in count)
+    vocabulary = {word: column for column, word in enumerate(document_frequency)}
+    matrix = np.zeros((len(texts), len(vocabulary)), dtype=np.float32)
+    for row, count in enumerate(counts):
+        for word, n in count.items():
+            matrix[row, vocabulary[word]] = (1 + math.log(n)) * math.log(1 + len(texts) / document_frequency[word])
+    return matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-9)
+
+
+def similarity(left, right, field):
+    matrix = tfidf([entry[field] for entry in left] + [entry[field] for entry in right])
+    return matrix[:len(left)] @ matrix[len(left):].T
+
+
+def build_crossref(ipc_pdf=IPC_PDF_PATH, bns_pdf=BNS_PDF_PATH):
+    ipc = act_sections(ipc_pdf, IPC_EDITORIAL)
+    for number, title in parse_section_table(ipc_pdf).items():
+        ipc.setdefault(number, {"text": ""})["title"] = clean_title(title)
+    bns = act_sections(bns_pdf)
+    for section in parse_sections(bns_pdf):
+        bns.setdefault(str(section["number"]), {"title": clean_title(section["title"]), "text": ""})
+
+    ipc_numbers = sorted(ipc, key=section_key)
+    bns_numbers = sorted(bns, key=section_key)
+    ipc_entries = [ipc[number] for number in ipc_numbers]
+    bns_entries = [bns[number] for number in bns_numbers]
+    titles = similarity(ipc_entries, bns_entries, "title")
+    texts = similarity(ipc_entries, bns_entries, "text")
+    has_text = np.array([[bool(entry["text"].strip())] for entry in ipc_entries])
+    scores = np.where(has_text, TITLE_WEIGHT * titles + (1 - TITLE_WEIGHT) * texts, titles)
+    # An IPC section the splitter missed has only its table title to match on.
+    text_floor = np.where(has_text[:, 0], MIN_TEXT_SCORE, -1.0)
+
+    table = {
+        "ipc_pdf_hash": file_sha256(ipc_pdf),
+        "bns_pdf_hash": file_sha256(bns_pdf),
+        "ipc": {},
+        "bns": {number: {"title": bns[number]["title"]} for number in bns_numbers},
+    }
+    for row, number in enumerate(ipc_numbers):
+        column = int(np.argmax(scores[row]))
+        score = float(scores[row, column])
+        title = titles[row, column]
+        matched = score >= MIN_SCORE and title >= MIN_TITLE_SCORE and (
+            texts[row, column] >= text_floor[row] or title >= SAME_TITLE_SCORE
+        )
+        match = [bns_numbers[column]] if matched else []
+        table["ipc"][number] = {"title": ipc[number]["title"], "bns": match, "score": round(score, 3)}
+    return table
+
+
+class CrossReference:
+
+    def __init__(self, table):
+        self.titles = {
+            "ipc": {number: entry["title"] for number, entry in table["ipc"].items()},
+            "bns": {number: entry["title"] for number, entry in table["bns"].items()},
+        }
+        self.targets = {number: entry["bns"] for number, entry in table["ipc"].items()}
+
+    @classmethod
+    def load(cls, path=CROSSREF_PATH):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def citation(self, query):
+        # Number of the first IPC section cited, e.g. "323"; "section 115 of BNS" cites none.
+        found = [match for match in (pattern.search(query) for pattern in IPC_CITATIONS) if match]
+        return min(found, key=lambda match: match.start()).group(1).upper() if found else None
+
+    def lookup(self, query):
+        number = self.citation(query)
+        targets = self.targets.get(number) if number else None
+        if not targets:
+            return None
+        return {
+            "act": "ipc",
+            "number": number,
+            "title": self.titles["ipc"][number],
+            "matches": [{"act": "bns", "number": target, "title": self.titles["bns"][target]} for target in targets],
+        }
+
+
+def format_lookup(result):
+    cited = f"{ACT_LABELS[result['act']]} section {result['number']} ({result['title']})"
+    matches = "; ".join(
+        f"{ACT_LABELS[match['act']]} section {match['number']} ({match['title']})" for match in result["matches"]
+    )
+    return f"{cited} corresponds to {matches}."
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the IPC -> BNS cross-reference table.")
+    parser.add_argument("queries", nargs="*", help='e.g. "IPC 323 in BNS?"')
+    parser.add_argument("--build", action="store_true")
+    parser.add_argument("--ipc", default=IPC_PDF_PATH)
+    parser.add_argument("--bns", default=BNS_PDF_PATH)
+    parser.add_argument("--output", default=CROSSREF_PATH)
+    args = parser.parse_args()
+
+    if args.build:
+        start = time.perf_counter()
+        table = build_crossref(args.ipc, args.bns)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(table, f, indent=1, ensure_ascii=False)
+        resolved = sum(bool(entry["bns"]) for entry in table["ipc"].values())
+        print(
+            f"{resolved}/{len(table['ipc'])} IPC sections matched to BNS sections, written to {args.output} "
+            f"({time.perf_counter() - start:.1f}s)"
+        )
+
+    crossref = CrossReference.load(args.output)
+    for query in args.queries:
+        start = time.perf_counter()
+        result = crossref.lookup(query)
+        elapsed = (time.perf_counter() - start) * 1e6
+        print(f"{query!r}: {format_lookup(result) if result else 'unresolved'} ({elapsed:.0f} µs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import json
+import os
+import sqlite3
+import threading
+
+from langchain_community.docstore.base import Docstore
+from langchain_core.documents import Document
+
+# Chunk text and metadata in a SQLite file, one row per chunk id, in place of the pickled
+# InMemoryDocstore. Rows are read on demand, so a process only holds the chunks it has
+# looked up, and worker processes reading the same file share the OS page cache.
+
+SCHEMA = """
+CREATE TABLE chunks (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    metadata TEXT NOT NULL
+)
+"""
+
+
+def write_docstore(path, entries):
+    # entries: (chunk id, Document) in FAISS position order. Written to a temporary file
+    # and renamed into place, so readers never see a half-written docstore.
+    tmp_path = path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    connection = sqlite3.connect(tmp_path)
+    try:
+        connection.execute(SCHEMA)
+        connection.executemany(
+            "INSERT INTO chunks VALUES (?, ?, ?, ?)",
+            (
+                (cid, position, document.page_content, json.dumps(document.metadata))
+                for position, (cid, document) in enumerate(entries)
+            ),
+        )
+        connection.commit()
+    finally:
+        connection.close()
+    os.replace(tmp_path, path)
+
+
+class SQLiteDocstore(Docstore):
+    # Read-only. Ingestion loads the index into memory, edits it and rewrites the file.
+
+    def __init__(self, path):
+        self.path = path
+        # One connection shared by the app's threads, serialised by the lock.
+        self.connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self.lock = threading.Lock()
+
+    def index_to_docstore_id(self):
+        with self.lock:
+            rows = self.connection.execute("SELECT position, id FROM chunks ORDER BY position").fetchall()
+        return dict(rows)
+
+    def search(self, search):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT content, metadata FROM chunks WHERE id = ?", (search,)
+            ).fetchone()
+        if row is None:
+            return f"ID {search} not found."
+        return Document(page_content=row[0], metadata=json.loads(row[1]))
+
+    def __iter__(self):
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT id, content, metadata FROM chunks ORDER BY position"
+            ).fetchall()
+        for cid, content, metadata in rows:
+            yield cid, Document(page_content=content, metadata=json.loads(metadata))
+
+    def __len__(self):
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
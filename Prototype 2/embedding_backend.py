@@ -0,0 +1,29 @@
+from config import EMBEDDING_BACKEND, EMBEDDING_BATCH_SIZE, EMBEDDING_MODEL, EMBEDDING_WORKERS, OLLAMA_BASE_URL
+
+# Known output sizes, used only for display; the real dimension is always read from the index.
+KNOWN_DIMENSIONS = {
+    "sentence-transformers/all-MiniLM-L6-v2": 384,
+    "BAAI/bge-small-en-v1.5": 384,
+    "sentence-transformers/all-mpnet-base-v2": 768,
+    "BAAI/bge-base-en-v1.5": 768,
+    "nomic-embed-text": 768,
+    "llama2:7b": 4096,
+}
+
+
+def get_embeddings(backend=EMBEDDING_BACKEND, model=EMBEDDING_MODEL):
+    if backend == "huggingface":
+        from langchain_community.embeddings import HuggingFaceEmbeddings
+
+        return HuggingFaceEmbeddings(
+            model_name=model,
+            model_kwargs={"device": "cpu"},
+            encode_kwargs={"normalize_embeddings": True, "batch_size": EMBEDDING_BATCH_SIZE},
+        )
+    if backend == "ollama":
+        from batch_embeddings import BatchedOllamaEmbeddings
+
+        return BatchedOllamaEmbeddings(
+            model, base_url=OLLAMA_BASE_URL, batch_size=EMBEDDING_BATCH_SIZE, workers=EMBEDDING_WORKERS
+        )
+    raise ValueError(f"Unknown embedding backend: {backend!r} (expected 'huggingface' or 'ollama')")
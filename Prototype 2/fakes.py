@@ -0,0 +1,175 @@
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.llms import LLM
+from langchain_core.outputs import GenerationChunk
+
+from config import BNS_PDF_PATH, EMBEDDING_BACKEND, EMBEDDING_MODEL
+
+# Local stand-ins for the Ollama server, used by the benchmarks so they run offline.
+
+
+def fake_vector(text, dimension=384):
+    # Deterministic bag-of-words hashing: texts sharing words get similar vectors.
+    vector = [0.0] * dimension
+    for word in re.findall(r"[a-z0-9]+", text.lower()):
+        digest = hashlib.md5(word.encode("utf-8")).digest()
+        index = int.from_bytes(digest[:4], "little") % dimension
+        vector[index] += 1.0 if digest[4] % 2 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class FakeEmbeddings(Embeddings):
+    # In-process stand-in for an embedding model, with optional per-call latency.
+
+    def __init__(self, dimension=384, latency=0.0):
+        self.dimension = dimension
+        self.latency = latency
+
+    def embed_documents(self, texts):
+        if self.latency:
+            time.sleep(self.latency)
+        return [fake_vector(text, self.dimension) for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+class FakeLLM(LLM):
+    # Stand-in for OllamaLLM: a fixed reply, produced word by word after a prompt-processing delay.
+
+    response: str = "Under the Bharatiya Nyaya Sanhita, the relevant section applies."
+    prompt_latency: float = 0.0
+    token_latency: float = 0.0
+
+    @property
+    def _llm_type(self):
+        return "fake"
+
+    def _call(self, prompt, stop=None, run_manager=None, **kwargs):
+        return "".join(chunk.text for chunk in self._stream(prompt, stop, run_manager, **kwargs))
+
+    def _stream(self, prompt, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.prompt_latency)
+        for token in re.findall(r"\S+\s*", self.response):
+            time.sleep(self.token_latency)
+            yield GenerationChunk(text=token)
+
+
+class FakeCrossEncoder:
+    # Stand-in for a sentence-transformers CrossEncoder: scores a (query, text) pair by the
+    # share of the query's content words found in the text, after a forward-pass delay of
+    # batch_latency plus pair_latency per pair.
+
+    def __init__(self, batch_latency=0.0, pair_latency=0.0):
+        self.batch_latency = batch_latency
+        self.pair_latency = pair_latency
+        self.calls = 0
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False):
+        from hybrid import bm25_tokens
+
+        self.calls += 1
+        time.sleep(self.batch_latency + self.pair_latency * len(pairs))
+        scores = []
+        for query, text in pairs:
+            words = set(bm25_tokens(query))
+            scores.append(len(words & set(bm25_tokens(text))) / len(words) if words else 0.0)
+        return scores
+
+
+def build_fake_index(index_path, pdf_path=BNS_PDF_PATH):
+    # Indexes the PDF with FakeEmbeddings, labelled as the configured embedder so that
+    # LegalAidService(index_path, embeddings=FakeEmbeddings()) accepts it. The section-title
+    # cache is written too, so services started concurrently only read it.
+    from ingest import ingest
+    from sections import SectionIndex
+
+    embedder_name = f"{EMBEDDING_BACKEND}:{EMBEDDING_MODEL}"
+    ingest({"bns": pdf_path}, FakeEmbeddings(), index_path, backend=EMBEDDING_BACKEND, model=EMBEDDING_MODEL)
+    SectionIndex.load(pdf_path, os.path.join(index_path, "sections.json"), FakeEmbeddings(), embedder_name)
+    return index_path
+
+
+class FakeEmbeddingServer:
+    # Mimics POST /api/embed. Each request costs a fixed overhead plus a per-text cost,
+    # and at most `capacity` requests are served at once; the rest get 503, like an
+    # overloaded Ollama behind a proxy.
+
+    def __init__(self, dimension=384, request_latency=0.02, per_text_latency=0.002, capacity=4, port=0):
+        self.dimension = dimension
+        self.request_latency = request_latency
+        self.per_text_latency = per_text_latency
+        self.capacity = capacity
+        self.in_flight = 0
+        self.rejected = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status, payload):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with fake.lock:
+                    if fake.in_flight >= fake.capacity:
+                        fake.rejected += 1
+                        self._reply(503, {"error": "server busy"})
+                        return
+                    fake.in_flight += 1
+                try:
+                    texts = request["input"]
+                    if isinstance(texts, str):
+                        texts = [texts]
+                    time.sleep(fake.request_latency + fake.per_text_latency * len(texts))
+                    vectors = [fake_vector(text, fake.dimension) for text in texts]
+                    self._reply(200, {"model": request.get("model"), "embeddings": vectors})
+                finally:
+                    with fake.lock:
+                        fake.in_flight -= 1
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,138 @@
+import re
+from io import BytesIO
+
+from docx import Document as DocxDocument
+from langchain_core.prompts import PromptTemplate
+
+from prompts import FIR_PART_TEMPLATE, FIR_SECTIONS_TEMPLATE
+from sections import format_sections
+
+# FIR drafting from a complaint narrative.
+#
+# The target format, Prototype 1/data/FIR format.docx, holds screenshots of the online FIR
+# and complaint forms rather than text, so its fields are transcribed below, grouped by the
+# tabs of the form. Each part is one LLM call whose prompt (with the field list filled in)
+# is built once per FirDrafter; the service keeps one drafter, so a draft costs only the
+# per-part generations plus one for the applicable sections.
+
+NOT_STATED = "Not stated"
+SECTIONS_PART = "Applicable BNS Sections"
+
+FIR_TEMPLATE = (
+    ("Complainant / Informant's details", (
+        ("Name", "full name of the person reporting"),
+        ("Parentage", "father's or husband's name"),
+        ("Gender", "Male, Female or Other"),
+        ("Date of Birth", "dd/mm/yyyy, or the age if only that is given"),
+        ("Address", "residential address"),
+        ("Mobile No.", "phone number"),
+        ("Email ID", "email address"),
+        ("Complainant is the victim", "Yes, or No followed by the victim's name"),
+    )),
+    ("Type of Incident", (
+        ("Type of Incident", "e.g. theft, robbery, assault, cheating, harassment"),
+        ("Place of Incident", "where it happened, as precisely as the complaint says"),
+        ("Police Station", "police station having jurisdiction, if mentioned"),
+        ("District", "district of the place of incident"),
+        ("Date From", "date of the incident, or when it started, dd/mm/yyyy"),
+        ("Date To", "when it ended, dd/mm/yyyy"),
+        ("Time From", "hh:mm"),
+        ("Time To", "hh:mm"),
+    )),
+    ("Suspect Details", (
+        ("No. of Suspects", "a number"),
+        ("Suspects can be identified", "Yes or No"),
+        ("Suspect description", "names, height, age, clothing, relation to the complainant"),
+        ("Vehicle used by suspect", "type and registration number"),
+    )),
+    ("Details of Property Stolen", (
+        ("Property", "each article with its description and value, separated by semicolons"),
+    )),
+    ("Details of Incident", (
+        ("Details of Incident", "what happened, in order, in formal third-person language, on one line"),
+    )),
+)
+
+FIELD_LINE = re.compile(r"^[\s*#>•-]*(.+?)[\s*]*:[\s*]*(.*?)[\s*]*$")
+
+
+def field_key(name):
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def format_fields(fields):
+    return "\n".join(f"{name}: <{hint}>" for name, hint in fields)
+
+
+def stream_lines(chunks):
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split("\n")
+        yield from lines
+    if buffer:
+        yield buffer
+
+
+def parse_field(line):
+    match = FIELD_LINE.match(line)
+    if match is None:
+        return None
+    return match.group(1), match.group(2)
+
+
+class FirDrafter:
+
+    def __init__(self, llm, template=FIR_TEMPLATE):
+        self.template = template
+        part_prompt = PromptTemplate.from_template(FIR_PART_TEMPLATE)
+        self.part_chains = [
+            (part, fields, part_prompt.partial(part=part, fields=format_fields(fields)) | llm)
+            for part, fields in template
+        ]
+        self.sections_chain = PromptTemplate.from_template(FIR_SECTIONS_TEMPLATE) | llm
+
+    def stream(self, narrative, documents=(), sections=()):
+        # Yields (part, field, value) as soon as the LLM finishes each field's line. Fields the
+        # reply leaves out come back as "Not stated"; lines naming unknown fields are dropped.
+        for part, fields, chain in self.part_chains:
+            names = {field_key(name): name for name, _ in fields}
+            filled = set()
+            for line in stream_lines(chain.stream({"narrative": narrative})):
+                parsed = parse_field(line)
+                name = parsed and names.get(field_key(parsed[0]))
+                if name and name not in filled:
+                    filled.add(name)
+                    yield part, name, parsed[1] or NOT_STATED
+            for name, _ in fields:
+                if name not in filled:
+                    yield part, name, NOT_STATED
+
+        inputs = {
+            "narrative": narrative,
+            "context": "\n\n".join(document.page_content for document in documents),
+            "sections": format_sections(sections),
+        }
+        for line in stream_lines(self.sections_chain.stream(inputs)):
+            parsed = parse_field(line)
+            if parsed is not None and parsed[0].lower().startswith("section"):
+                yield SECTIONS_PART, parsed[0], parsed[1]
+
+
+def export_docx(draft, narrative=None):
+    document = DocxDocument()
+    document.add_heading("First Information Report", level=0)
+    for part, fields in draft.items():
+        document.add_heading(part, level=1)
+        table = document.add_table(rows=0, cols=2)
+        table.style = "Table Grid"
+        for field, value in fields.items():
+            cells = table.add_row().cells
+            cells[0].text = field
+            cells[1].text = value
+    if narrative:
+        document.add_heading("Complaint as given", level=1)
+        document.add_paragraph(narrative)
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
@@ -0,0 +1,138 @@
+import math
+import re
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from index_store import all_documents
+from rephrase import STOP_WORDS
+
+# Hybrid retrieval over the indexed chunks:
+#   * "section 115"-style queries are answered from a section-number dictionary, with no
+#     embedding call and no vector search, unless they name another act ("IPC section 34");
+#   * everything else runs an in-process BM25 search and a FAISS search and fuses the two
+#     rankings with reciprocal rank fusion, so exact statutory phrases are not lost to the
+#     embedding model.
+
+# "section 115", "sec. 115", "s. 115"; not the "'s" of "he's 17" or "friend's 2 phones".
+SECTION_QUERY = re.compile(r"(?<![\w'’])(?:section|sec\.|s\.)\s*(\d{1,3}[A-Z]?)\b", re.IGNORECASE)
+BM25_TOKEN = re.compile(r"[a-z0-9]+")
+RRF_K = 60
+
+# Names a question may use for each act (shards.py routes on these too).
+ACT_NAMES = {
+    "bns": ("bns", "bharatiya nyaya sanhita", "bhartiya nyay sanhita", "nyaya sanhita"),
+    "ipc": ("ipc", "indian penal code", "penal code"),
+    "bnss": ("bnss", "bharatiya nagarik suraksha sanhita", "nagarik suraksha sanhita"),
+    "bsa": ("bsa", "bharatiya sakshya adhiniyam", "sakshya adhiniyam"),
+}
+
+
+def act_pattern(act):
+    names = ACT_NAMES.get(act, (act,))
+    return re.compile(r"\b(?:" + "|".join(re.escape(name) for name in names) + r")\b", re.IGNORECASE)
+
+
+def bm25_tokens(text):
+    return [token for token in BM25_TOKEN.findall(text.lower()) if token not in STOP_WORDS and len(token) > 1]
+
+
+class BM25Index:
+
+    # Holds term statistics only; search() returns positions into the texts it was built from.
+
+    def __init__(self, texts, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(list)
+        self.lengths = []
+        for position, text in enumerate(texts):
+            counts = Counter(bm25_tokens(text))
+            self.lengths.append(sum(counts.values()))
+            for term, count in counts.items():
+                self.postings[term].append((position, count))
+        self.average_length = sum(self.lengths) / max(len(self.lengths), 1)
+        total = len(self.lengths)
+        self.idf = {
+            term: math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items()
+        }
+
+    def search(self, query, k=10):
+        scores = defaultdict(float)
+        for term in set(bm25_tokens(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for position, count in self.postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[position] / self.average_length)
+                scores[position] += idf * count * (self.k1 + 1) / (count + norm)
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+
+def chunk_key(document):
+    return document.metadata.get("chunk_id") or document.page_content
+
+
+def reciprocal_rank_fusion(rankings, k):
+    scores = defaultdict(float)
+    documents = {}
+    for ranking in rankings:
+        for rank, document in enumerate(ranking):
+            key = chunk_key(document)
+            scores[key] += 1.0 / (RRF_K + rank + 1)
+            documents.setdefault(key, document)
+    ranked = sorted(scores, key=scores.get, reverse=True)[:k]
+    return [documents[key] for key in ranked]
+
+
+# One FAISS call for a whole matrix of query vectors instead of one call per query.
+def vector_search_many(db, vectors, k):
+    _, positions = db.index.search(np.asarray(vectors, dtype=np.float32), k)
+    return [
+        [db.docstore.search(db.index_to_docstore_id[position]) for position in row if position != -1]
+        for row in positions
+    ]
+
+
+class HybridRetriever:
+
+    def __init__(self, db, act="bns"):
+        # Only chunk ids are kept; documents are fetched from the docstore per query.
+        self.db = db
+        self.other_acts = [act_pattern(other) for other in ACT_NAMES if other != act]
+        self.ids = list(db.index_to_docstore_id.values())
+        documents = all_documents(db)
+        self.bm25 = BM25Index(document.page_content for document in documents)
+        # Section number -> that section's chunk ids, in reading order. Needs section metadata
+        # from the section-aware splitter; with the recursive splitter the dictionary is empty.
+        sections = defaultdict(list)
+        for cid, document in zip(self.ids, documents):
+            metadata = document.metadata
+            if metadata.get("act", act) == act and "section" in metadata:
+                order = (metadata.get("page_start", 0), metadata.get("subsection") or "")
+                sections[str(metadata["section"]).upper()].append((order, cid))
+        self.sections = {number: [cid for _, cid in sorted(chunks)] for number, chunks in sections.items()}
+
+    def lookup_section(self, query):
+        # "IPC section 34 in BNS?" is about IPC 34, not this act's section 34.
+        match = SECTION_QUERY.search(query)
+        if match is None or any(pattern.search(query) for pattern in self.other_acts):
+            return []
+        return [self.db.docstore.search(cid) for cid in self.sections.get(match.group(1).upper(), [])]
+
+    def keyword_search(self, query_text, k=20):
+        # BM25 alone: no query embedding needed.
+        return [self.db.docstore.search(self.ids[position]) for position, _ in self.bm25.search(query_text, k)]
+
+    def search(self, query_text, query_vector, k=4, candidates=20):
+        return self.search_many([query_text], [query_vector], k, candidates)[0]
+
+    def search_many(self, query_texts, query_vectors, k=4, candidates=20):
+        # Each retriever fetches at least k, so the fused list is never shorter than asked for.
+        candidates = max(candidates, k)
+        results = []
+        for query_text, vector_hits in zip(query_texts, vector_search_many(self.db, query_vectors, candidates)):
+            keyword_hits = self.keyword_search(query_text, candidates)
+            results.append(reciprocal_rank_fusion([vector_hits, keyword_hits], k))
+        return results
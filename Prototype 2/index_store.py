@@ -0,0 +1,166 @@
+import json
+import os
+
+import faiss
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+
+from config import EMBEDDING_BACKEND, EMBEDDING_MODEL
+from docstore import SQLiteDocstore, write_docstore
+from index_types import build_index, set_search_params, stored_vectors
+
+METADATA_FILE = "embedder.json"
+INDEX_FILE = "index.faiss"
+DOCSTORE_FILE = "docstore.sqlite"
+# Approximate index (index_types.py) served in place of index.faiss when one was built.
+SEARCH_INDEX_FILE = "search.faiss"
+# LangChain's save_local() format: docstore and id mapping pickled next to index.faiss.
+LEGACY_DOCSTORE_FILE = "index.pkl"
+
+# Flat indexes are only memory-mapped with IO_FLAG_MMAP_IFC (faiss >= 1.10);
+# older builds fall back to IO_FLAG_MMAP, which maps inverted lists but copies flat vectors.
+MMAP_FLAGS = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+
+# Indexes saved before the metadata file existed were all built with llama2:7b through Ollama.
+LEGACY_METADATA = {"backend": "ollama", "model": "llama2:7b", "dimension": 4096}
+
+
+def read_metadata(index_path):
+    metadata_path = os.path.join(index_path, METADATA_FILE)
+    if not os.path.exists(metadata_path):
+        return dict(LEGACY_METADATA)
+    with open(metadata_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_metadata(index_path, db, backend=EMBEDDING_BACKEND, model=EMBEDDING_MODEL, search_index=None):
+    metadata = {"backend": backend, "model": model, "dimension": db.index.d}
+    if search_index is not None and search_index["type"] != "flat":
+        metadata["search_index"] = search_index
+    with open(os.path.join(index_path, METADATA_FILE), "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+    return metadata
+
+
+# Vectors in FAISS's own binary format and chunks in a SQLite docstore; nothing is unpickled.
+# Each file is written under a temporary name and renamed, so a process that has the old
+# files mapped keeps reading them until it reloads.
+def save_index(index_path, db):
+    os.makedirs(index_path, exist_ok=True)
+    ids = [db.index_to_docstore_id[position] for position in range(db.index.ntotal)]
+    write_docstore(os.path.join(index_path, DOCSTORE_FILE), ((cid, db.docstore.search(cid)) for cid in ids))
+    index_file = os.path.join(index_path, INDEX_FILE)
+    faiss.write_index(db.index, index_file + ".tmp")
+    os.replace(index_file + ".tmp", index_file)
+    legacy_file = os.path.join(index_path, LEGACY_DOCSTORE_FILE)
+    if os.path.exists(legacy_file):
+        os.remove(legacy_file)
+
+
+# index.faiss always holds the exact vectors, so ingestion can add and delete chunks and
+# retrain from them; the approximate index is rebuilt from it after every change.
+def save_search_index(index_path, index, spec):
+    search_file = os.path.join(index_path, SEARCH_INDEX_FILE)
+    if spec["type"] == "flat":
+        if os.path.exists(search_file):
+            os.remove(search_file)
+        return
+    search_index = build_index(stored_vectors(index), spec, index.metric_type)
+    faiss.write_index(search_index, search_file + ".tmp")
+    os.replace(search_file + ".tmp", search_file)
+
+
+# Sharded layout (shards.py): one complete index directory per act under index_path.
+def shard_path(index_path, act):
+    return os.path.join(index_path, act)
+
+
+def shard_acts(index_path):
+    if not os.path.isdir(index_path) or os.path.exists(os.path.join(index_path, INDEX_FILE)):
+        return []
+    return sorted(
+        name for name in os.listdir(index_path) if os.path.exists(os.path.join(index_path, name, INDEX_FILE))
+    )
+
+
+def all_documents(db):
+    return [db.docstore.search(cid) for cid in db.index_to_docstore_id.values()]
+
+
+# Refuses to open an index whose vectors came from a different embedder: the query
+# vectors would live in a different space and every search would silently return noise.
+#
+# With mmap (the default, for serving) the vectors are memory-mapped read-only and chunks
+# are read from SQLite on demand, so worker processes share one copy in the page cache.
+# Without it (for ingestion) both are loaded into memory and can be modified.
+# When the index has an approximate search index, serving uses that instead of the flat
+# vectors, with the search parameters it was built with.
+def load_index(index_path, embeddings, backend=EMBEDDING_BACKEND, model=EMBEDDING_MODEL, mmap=True):
+    metadata = read_metadata(index_path)
+    if metadata["backend"] != backend or metadata["model"] != model:
+        raise ValueError(
+            f"FAISS index at {index_path} was built with {metadata['backend']}:{metadata['model']} "
+            f"but the configured embedder is {backend}:{model}. "
+            "Run `python migrate_index.py` to re-embed the index."
+        )
+
+    docstore_file = os.path.join(index_path, DOCSTORE_FILE)
+    if not os.path.exists(docstore_file):
+        if os.path.exists(os.path.join(index_path, LEGACY_DOCSTORE_FILE)):
+            raise ValueError(
+                f"FAISS index at {index_path} uses the pickle format, which can run arbitrary code when loaded. "
+                "If you trust it, run `python migrate_index.py --convert` to rewrite it in the safe format."
+            )
+        raise ValueError(f"FAISS index at {index_path} has no {DOCSTORE_FILE}.")
+
+    index_file = os.path.join(index_path, INDEX_FILE)
+    store = SQLiteDocstore(docstore_file)
+    index_to_docstore_id = store.index_to_docstore_id()
+    search_index = metadata.get("search_index")
+    if mmap and search_index is not None:
+        index = faiss.read_index(os.path.join(index_path, SEARCH_INDEX_FILE), MMAP_FLAGS)
+        set_search_params(index, search_index)
+        docstore = store
+    elif mmap:
+        index = faiss.read_index(index_file, MMAP_FLAGS)
+        docstore = store
+    else:
+        index = faiss.read_index(index_file)
+        docstore = InMemoryDocstore(dict(store))
+        store.close()
+
+    db = FAISS(embeddings, index, docstore, index_to_docstore_id)
+    if db.index.d != metadata["dimension"]:
+        raise ValueError(
+            f"FAISS index at {index_path} has dimension {db.index.d}, "
+            f"metadata says {metadata['dimension']}."
+        )
+    if db.index.ntotal != len(index_to_docstore_id):
+        raise ValueError(
+            f"FAISS index at {index_path} holds {db.index.ntotal} vectors for {len(index_to_docstore_id)} chunks. "
+            "Run `python ingest.py` to rebuild it."
+        )
+    return db
+
+
+# Rewrites an index saved by FAISS.save_local() in the safe format. This unpickles
+# index.pkl, so only run it on an index you built yourself.
+def convert_legacy_index(index_path, embeddings):
+    db = FAISS.load_local(index_path, embeddings, allow_dangerous_deserialization=True)
+    save_index(index_path, db)
+    return db
+
+
+# Changes whenever the index files are rewritten; caches derived from search results
+# store it and drop themselves when it no longer matches.
+def index_fingerprint(index_path):
+    acts = shard_acts(index_path)
+    if acts:
+        return "|".join(f"{act}/{index_fingerprint(shard_path(index_path, act))}" for act in acts)
+    parts = []
+    for name in (INDEX_FILE, SEARCH_INDEX_FILE, METADATA_FILE):
+        path = os.path.join(index_path, name)
+        if os.path.exists(path):
+            stat = os.stat(path)
+            parts.append(f"{name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return "|".join(parts)
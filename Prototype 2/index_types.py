@@ -0,0 +1,83 @@
+import math
+
+import faiss
+import numpy as np
+
+from config import FAISS_EF_SEARCH, FAISS_HNSW_M, FAISS_NLIST, FAISS_NPROBE, FAISS_PQ_M
+
+# FAISS index types for the search index, built from the exact flat index's vectors.
+#
+#   flat      exact search, 4 bytes per dimension (what FAISS.from_documents builds)
+#   hnsw      graph search, flat vectors plus FAISS_HNSW_M links per vector; fastest queries
+#   ivf-flat  vectors bucketed into nlist k-means cells, nprobe cells scanned per query
+#   ivf-pq    as ivf-flat, vectors compressed to pq_m one-byte codes by trained codebooks
+#   sq-fp16   each dimension stored as float16 (half the memory, near-exact)
+#   sq8       each dimension stored as one byte (a quarter of the memory)
+#
+# k-means needs about 39 training points per centroid, so on a small corpus nlist and the
+# PQ code size shrink to what the vectors can train; 0 for nlist or pq_m picks that size.
+
+INDEX_TYPES = ("flat", "hnsw", "ivf-flat", "ivf-pq", "sq-fp16", "sq8")
+POINTS_PER_CENTROID = 39
+
+
+def auto_nlist(count):
+    return max(1, min(int(4 * math.sqrt(count)), count // POINTS_PER_CENTROID))
+
+
+def pq_bits(count):
+    return max(4, min(8, int(math.log2(max(count, 1) / POINTS_PER_CENTROID))))
+
+
+def auto_pq_m(dimension):
+    # 8 dimensions per one-byte code: 32x smaller than float32.
+    for m in range(max(1, dimension // 8), 0, -1):
+        if dimension % m == 0:
+            return m
+    return 1
+
+
+def index_spec(index_type, dimension, count, nlist=FAISS_NLIST, nprobe=FAISS_NPROBE, pq_m=FAISS_PQ_M,
+               hnsw_m=FAISS_HNSW_M, ef_search=FAISS_EF_SEARCH):
+    # The factory string plus the search-time parameters, as stored in embedder.json.
+    if index_type == "flat":
+        return {"type": "flat", "factory": "Flat"}
+    if index_type == "hnsw":
+        return {"type": "hnsw", "factory": f"HNSW{hnsw_m}", "efSearch": ef_search}
+    if index_type in ("ivf-flat", "ivf-pq"):
+        nlist = nlist or auto_nlist(count)
+        codes = "Flat"
+        if index_type == "ivf-pq":
+            pq_m = pq_m or auto_pq_m(dimension)
+            if dimension % pq_m:
+                raise ValueError(f"pq_m={pq_m} does not divide the embedding dimension {dimension}")
+            codes = f"PQ{pq_m}x{pq_bits(count)}"
+        return {"type": index_type, "factory": f"IVF{nlist},{codes}", "nprobe": min(nprobe, nlist)}
+    if index_type == "sq-fp16":
+        return {"type": "sq-fp16", "factory": "SQfp16"}
+    if index_type == "sq8":
+        return {"type": "sq8", "factory": "SQ8"}
+    raise ValueError(f"Unknown FAISS index type: {index_type!r} (expected one of {', '.join(INDEX_TYPES)})")
+
+
+def stored_vectors(index):
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def build_index(vectors, spec, metric=faiss.METRIC_L2):
+    # Vectors are added in order, so position i still maps to the same docstore id.
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    index = faiss.index_factory(vectors.shape[1], spec["factory"], metric)
+    if not index.is_trained:
+        index.train(vectors)
+    index.add(vectors)
+    set_search_params(index, spec)
+    return index
+
+
+def set_search_params(index, spec):
+    parameters = faiss.ParameterSpace()
+    for name in ("nprobe", "efSearch"):
+        if name in spec:
+            parameters.set_index_parameter(index, name, spec[name])
+    return index
@@ -0,0 +1,275 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_community.vectorstores import FAISS
+
+from config import (
+    CHUNK_OVERLAP, CHUNK_SIZE, CHUNKING_STRATEGY, EMBEDDING_BACKEND, EMBEDDING_MODEL, FAISS_EF_SEARCH,
+    FAISS_INDEX_PATH, FAISS_INDEX_TYPE, FAISS_NLIST, FAISS_NPROBE, FAISS_PQ_M, SECTION_CHUNK_MAX_CHARS,
+    STATUTE_PDFS,
+)
+from embedding_backend import get_embeddings
+from index_store import (
+    INDEX_FILE, SEARCH_INDEX_FILE, load_index, read_metadata, save_index, save_search_index, shard_acts, shard_path,
+    write_metadata,
+)
+from index_types import INDEX_TYPES, index_spec
+from pdf_pages import EXTRACTOR, file_sha256, load_pages
+from section_splitter import SectionTextSplitter
+
+# Incremental, content-addressed ingestion of statute PDFs into faiss_index.
+#
+# Every page and every chunk is hashed and recorded in faiss_index/manifest.json.
+# A chunk's id is the hash of its act and text, so on a re-run only chunks whose text
+# is new get embedded, chunks that disappeared are deleted, and an unchanged PDF is
+# skipped without even being parsed. Changing the chunking strategy re-chunks every act.
+# Page text comes from pdf_pages.py (parallel, headers stripped, cached by PDF hash).
+#
+#   python ingest.py                                  # re-sync the acts already indexed (same search index)
+#   python ingest.py --add ipc="../Prototype 1/data/ipc.pdf"
+#   python ingest.py --remove ipc
+#   python ingest.py --index-type ivf-pq --nprobe 16     # rebuild only the search index
+#   python ingest.py --shards --add ipc="../Prototype 1/data/ipc.pdf"   # one index per act (shards.py)
+
+MANIFEST_FILE = "manifest.json"
+
+
+def text_sha256(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def chunk_id(act, text):
+    return text_sha256(f"{act}\0{text}")
+
+
+def load_manifest(index_path):
+    manifest_path = os.path.join(index_path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(index_path, manifest):
+    tmp_path = os.path.join(index_path, MANIFEST_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, os.path.join(index_path, MANIFEST_FILE))
+
+
+def make_splitter(chunking=CHUNKING_STRATEGY):
+    if chunking == "section":
+        return SectionTextSplitter(max_chars=SECTION_CHUNK_MAX_CHARS)
+    if chunking == "recursive":
+        return RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    raise ValueError(f"Unknown chunking strategy: {chunking!r} (expected 'section' or 'recursive')")
+
+
+# Splitting is cheap; only embedding is skipped for chunks that are already in the index.
+def chunk_source(act, pdf_path, previous_pages, text_splitter, file_hash=None):
+    pages = load_pages(pdf_path, pdf_hash=file_hash)
+    page_hashes = {}
+    changed_pages = 0
+
+    for page in pages:
+        page.metadata["act"] = act
+        page_number = str(page.metadata.get("page", 0))
+        page_hashes[page_number] = text_sha256(page.page_content)
+        if previous_pages.get(page_number) != page_hashes[page_number]:
+            changed_pages += 1
+
+    chunks = {}
+    for chunk in text_splitter.split_documents(pages):
+        cid = chunk_id(act, chunk.page_content)
+        chunk.metadata["chunk_id"] = cid
+        chunks.setdefault(cid, chunk)
+
+    return page_hashes, chunks, changed_pages
+
+
+def ingest(sources, embeddings, index_path=FAISS_INDEX_PATH, remove=(),
+           backend=EMBEDDING_BACKEND, model=EMBEDDING_MODEL, chunking=CHUNKING_STRATEGY,
+           index_type=None, index_options=None):
+    # index_type=None keeps the search index an existing index was built with (FAISS_INDEX_TYPE
+    # for a new one); a re-sync only switches types when one is asked for.
+    # A combined index written over the shards would shadow them (shard_acts ignores a
+    # directory holding its own index.faiss), so sharded indexes go through ingest_shards.
+    if shard_acts(index_path):
+        raise ValueError(f"{index_path} holds per-act shards; ingest them with ingest_shards (--shards).")
+    manifest = load_manifest(index_path)
+    db = None
+    previous_search_index = None
+    if manifest is not None and os.path.exists(index_path):
+        db = load_index(index_path, embeddings, backend, model, mmap=False)
+        previous_search_index = read_metadata(index_path).get("search_index") or index_spec("flat", 0, 0)
+    else:
+        if os.path.exists(index_path):
+            print(f"{index_path} has no ingestion manifest; building a fresh index.")
+        manifest = {"sources": {}}
+
+    # Acts indexed on earlier runs stay in the index unless explicitly removed.
+    all_sources = {act: record["path"] for act, record in manifest["sources"].items()}
+    all_sources.update(sources)
+    for act in remove:
+        all_sources.pop(act, None)
+
+    text_splitter = make_splitter(chunking)
+    stats = {"acts_skipped": 0, "pages_changed": 0, "chunks_added": 0, "chunks_removed": 0}
+    to_add = {}
+    to_delete = set()
+    # Whether any act was removed or re-chunked; otherwise the index files are left alone,
+    # so their mtimes (and the answer cache keyed on them) survive a no-op run.
+    changed = db is None
+
+    for act in list(manifest["sources"]):
+        if act not in all_sources:
+            to_delete.update(manifest["sources"][act]["chunks"])
+            del manifest["sources"][act]
+            changed = True
+
+    for act, pdf_path in all_sources.items():
+        previous = manifest["sources"].get(act, {"file_hash": None, "chunking": None, "pages": {}, "chunks": []})
+        file_hash = file_sha256(pdf_path)
+        if (db is not None and previous["file_hash"] == file_hash and previous["chunking"] == chunking
+                and previous.get("extractor") == EXTRACTOR):
+            stats["acts_skipped"] += 1
+            continue
+
+        changed = True
+        page_hashes, chunks, changed_pages = chunk_source(
+            act, pdf_path, previous["pages"], text_splitter, file_hash
+        )
+        old_ids = set(previous["chunks"])
+        stats["pages_changed"] += changed_pages
+
+        to_delete.update(old_ids - chunks.keys())
+        for cid, chunk in chunks.items():
+            if cid in old_ids and db is not None:
+                # Already embedded; refresh the stored metadata (e.g. a page number that moved).
+                db.docstore._dict[cid] = chunk
+            else:
+                to_add[cid] = chunk
+
+        manifest["sources"][act] = {
+            "path": os.path.abspath(pdf_path),
+            "file_hash": file_hash,
+            "chunking": chunking,
+            "extractor": EXTRACTOR,
+            "pages": page_hashes,
+            "chunks": list(chunks),
+        }
+
+    if db is not None and to_delete:
+        db.delete(list(to_delete))
+    stats["chunks_removed"] = len(to_delete)
+
+    if to_add:
+        ids = list(to_add)
+        documents = [to_add[cid] for cid in ids]
+        if db is None:
+            db = FAISS.from_documents(documents=documents, embedding=embeddings, ids=ids)
+        else:
+            db.add_documents(documents, ids=ids)
+    stats["chunks_added"] = len(to_add)
+
+    if db is None:
+        raise ValueError("Nothing to index: no statute PDFs were given.")
+
+    # The approximate index is only retrained when the vectors or its settings changed.
+    if index_type is None and previous_search_index is not None:
+        search_index = previous_search_index
+    else:
+        search_index = index_spec(index_type or FAISS_INDEX_TYPE, db.index.d, db.index.ntotal, **(index_options or {}))
+    search_changed = search_index != previous_search_index or (
+        search_index["type"] != "flat" and not os.path.exists(os.path.join(index_path, SEARCH_INDEX_FILE))
+    )
+    if changed:
+        save_index(index_path, db)
+    if to_add or to_delete or search_changed:
+        save_search_index(index_path, db.index, search_index)
+    if changed or search_changed:
+        write_metadata(index_path, db, backend, model, search_index)
+    stats["search_index"] = search_index["factory"]
+    if changed:
+        save_manifest(index_path, manifest)
+    return db, stats
+
+
+# Per-act shards: each act is ingested incrementally into its own index directory. Shards
+# already built are re-synced from their own manifests.
+def ingest_shards(sources, embeddings, index_path=FAISS_INDEX_PATH, remove=(), **options):
+    if os.path.exists(os.path.join(index_path, INDEX_FILE)):
+        raise ValueError(f"{index_path} holds a single combined index; move it away before building shards.")
+    results = {}
+    for act in remove:
+        shutil.rmtree(shard_path(index_path, act), ignore_errors=True)
+    acts = [act for act in shard_acts(index_path) if act not in sources] + list(sources)
+    for act in acts:
+        if act in remove:
+            continue
+        act_sources = {act: sources[act]} if act in sources else {}
+        results[act] = ingest(act_sources, embeddings, shard_path(index_path, act), **options)
+    return results
+
+
+def parse_source(value):
+    act, sep, path = value.partition("=")
+    if not sep or not act or not path:
+        raise argparse.ArgumentTypeError(f"expected ACT=PATH, got {value!r}")
+    return act, path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally index statute PDFs into the FAISS index.")
+    parser.add_argument("--add", type=parse_source, action="append", default=[], metavar="ACT=PATH")
+    parser.add_argument("--remove", action="append", default=[], metavar="ACT")
+    parser.add_argument("--index-path", default=FAISS_INDEX_PATH)
+    parser.add_argument(
+        "--shards", action="store_true", help="build one index per act under --index-path (implied if it has shards)"
+    )
+    parser.add_argument(
+        "--index-type", choices=INDEX_TYPES,
+        help=f"switch the search index (default: keep the current one; {FAISS_INDEX_TYPE} for a new index)",
+    )
+    parser.add_argument("--nlist", type=int, default=FAISS_NLIST, help="IVF cells (0: sized from the corpus)")
+    parser.add_argument("--nprobe", type=int, default=FAISS_NPROBE, help="IVF cells scanned per query")
+    parser.add_argument("--pq-m", type=int, default=FAISS_PQ_M, help="PQ codes per vector (0: dimension / 8)")
+    parser.add_argument("--ef-search", type=int, default=FAISS_EF_SEARCH, help="HNSW candidates per query")
+    args = parser.parse_args()
+
+    sources = dict(STATUTE_PDFS)
+    sources.update(args.add)
+
+    start = time.perf_counter()
+    options = {"nlist": args.nlist, "nprobe": args.nprobe, "pq_m": args.pq_m, "ef_search": args.ef_search}
+    if args.shards or shard_acts(args.index_path):
+        results = ingest_shards(
+            sources, get_embeddings(), args.index_path, remove=args.remove, index_type=args.index_type,
+            index_options=options,
+        )
+        for act, (db, stats) in results.items():
+            print(
+                f"{act}: {db.index.ntotal} chunks, added {stats['chunks_added']}, "
+                f"removed {stats['chunks_removed']}, searched with {stats['search_index']}"
+            )
+        print(f"{len(results)} shards in {args.index_path} ({time.perf_counter() - start:.1f}s).")
+        return
+    db, stats = ingest(
+        sources, get_embeddings(), args.index_path, remove=args.remove, index_type=args.index_type,
+        index_options=options,
+    )
+    print(
+        f"Index has {db.index.ntotal} chunks, searched with {stats['search_index']}. "
+        f"Added {stats['chunks_added']}, removed {stats['chunks_removed']}, "
+        f"{stats['pages_changed']} pages changed, {stats['acts_skipped']} acts unchanged "
+        f"({time.perf_counter() - start:.1f}s)."
+    )
+
+
+if __name__ == "__main__":
+    main()
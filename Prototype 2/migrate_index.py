@@ -0,0 +1,82 @@
+import argparse
+import os
+import shutil
+import time
+
+from config import EMBEDDING_BACKEND, EMBEDDING_MODEL, FAISS_INDEX_PATH, FAISS_INDEX_TYPE, STATUTE_PDFS
+from embedding_backend import get_embeddings
+from index_store import convert_legacy_index, read_metadata, shard_acts, shard_path
+from ingest import ingest, load_manifest
+
+# Rebuilds faiss_index with a new embedding model.
+# The new index is written next to the old one and only swapped in once it is complete,
+# so an interrupted migration never leaves a half-written index behind. A sharded index
+# (ingest.py --shards) is re-embedded one shard at a time and swapped in as a whole.
+#
+#   python migrate_index.py --backend huggingface --model sentence-transformers/all-MiniLM-L6-v2
+#
+# --convert rewrites an index saved in LangChain's pickle format (index.pkl) as
+# index.faiss + docstore.sqlite without re-embedding anything.
+
+
+def current_sources(index_path, defaults):
+    # Re-embed every act the current index holds, not just the default ones, and keep
+    # serving it with the same kind of search index.
+    sources = dict(defaults)
+    index_type = FAISS_INDEX_TYPE
+    if os.path.exists(index_path):
+        old = read_metadata(index_path)
+        index_type = old.get("search_index", {}).get("type", index_type)
+        print(f"Current index {index_path}: {old['backend']}:{old['model']} ({old['dimension']} dims)")
+        manifest = load_manifest(index_path)
+        if manifest is not None:
+            sources.update({act: record["path"] for act, record in manifest["sources"].items()})
+    return sources, index_type
+
+
+def reembed(sources, embeddings, index_path, args, index_type):
+    print(f"Embedding {', '.join(sources)} with {args.backend}:{args.model}...")
+    db, _ = ingest(sources, embeddings, index_path, backend=args.backend, model=args.model, index_type=index_type)
+    print(f"  {db.index.ntotal} vectors in {index_path}")
+    return db
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-embed the FAISS index with a different embedding model.")
+    parser.add_argument("--backend", default=EMBEDDING_BACKEND, choices=["huggingface", "ollama"])
+    parser.add_argument("--model", default=EMBEDDING_MODEL)
+    parser.add_argument("--index-path", default=FAISS_INDEX_PATH)
+    parser.add_argument("--convert", action="store_true", help="convert a pickled index to the safe format in place")
+    args = parser.parse_args()
+
+    if args.convert:
+        db = convert_legacy_index(args.index_path, get_embeddings(args.backend, args.model))
+        print(f"Converted {db.index.ntotal} chunks in {args.index_path}")
+        return
+
+    embeddings = get_embeddings(args.backend, args.model)
+    tmp_path = args.index_path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    start = time.perf_counter()
+    acts = shard_acts(args.index_path)
+    if acts:
+        # A sharded index is migrated shard by shard, each keeping its own acts and search index.
+        for act in acts:
+            sources, index_type = current_sources(shard_path(args.index_path, act), {})
+            db = reembed(sources, embeddings, shard_path(tmp_path, act), args, index_type)
+    else:
+        sources, index_type = current_sources(args.index_path, STATUTE_PDFS)
+        db = reembed(sources, embeddings, tmp_path, args, index_type)
+    print(f"Built vectors of dimension {db.index.d} in {time.perf_counter() - start:.1f}s")
+
+    if os.path.exists(args.index_path):
+        backup_path = args.index_path + ".bak"
+        shutil.rmtree(backup_path, ignore_errors=True)
+        os.rename(args.index_path, backup_path)
+        print(f"Previous index kept at {backup_path}")
+    os.rename(tmp_path, args.index_path)
+    print(f"New index saved to {args.index_path}")
+
+
+if __name__ == "__main__":
+    main()
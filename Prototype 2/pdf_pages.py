@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from langchain_core.documents import Document
+from pypdf import PdfReader
+
+from config import PAGE_CACHE_DIR, PDF_WORKERS
+
+# Page text of a statute PDF, as PyPDFLoader(...).load() returns it, minus running headers
+# and page numbers, and parsed once per PDF.
+#
+# pypdf parses pages in pure Python, so pages are split into one contiguous range per worker
+# process. The raw text of every page is cached in PAGE_CACHE_DIR/<sha256 of the PDF>.json;
+# re-chunking or re-embedding the same PDF reads that file instead of parsing it again.
+#
+# Headers and footers are what repeats at the edge of most pages: the first and last
+# EDGE_LINES non-blank lines of each page are compared with digits masked ("41", "Page 12 of
+# 108"), and those found on at least FURNITURE_SHARE of the pages are dropped. Stripping runs
+# on every load, so changing it does not invalidate the cache; bump EXTRACTOR instead, and
+# ingest.py re-chunks the acts it recorded under the previous one.
+
+EXTRACTOR = "pypdf-stripped-1"
+EDGE_LINES = 2
+FURNITURE_SHARE = 0.5
+MIN_FURNITURE_PAGES = 3
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def extract_range(pdf_path, start, stop):
+    reader = PdfReader(pdf_path)
+    return [reader.pages[number].extract_text() for number in range(start, stop)]
+
+
+def extract_pages(pdf_path, workers=PDF_WORKERS):
+    # [(page_label, raw text)] for every page, in order.
+    reader = PdfReader(pdf_path)
+    count = len(reader.pages)
+    labels = list(reader.page_labels)
+    workers = max(1, min(workers, count))
+    if workers == 1:
+        return list(zip(labels, extract_range(pdf_path, 0, count)))
+    bounds = [count * worker // workers for worker in range(workers + 1)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        ranges = pool.map(extract_range, [pdf_path] * workers, bounds[:-1], bounds[1:])
+        texts = [text for texts in ranges for text in texts]
+    return list(zip(labels, texts))
+
+
+def cache_file(cache_dir, pdf_hash):
+    return os.path.join(cache_dir, f"{pdf_hash}.json")
+
+
+def cached_pages(pdf_path, workers=PDF_WORKERS, cache_dir=PAGE_CACHE_DIR, pdf_hash=None):
+    if not cache_dir:
+        return extract_pages(pdf_path, workers)
+    path = cache_file(cache_dir, pdf_hash or file_sha256(pdf_path))
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return [tuple(page) for page in json.load(f)["pages"]]
+    pages = extract_pages(pdf_path, workers)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"source": os.path.basename(pdf_path), "pages": pages}, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return pages
+
+
+def edge_key(line):
+    return re.sub(r"\d+", "#", " ".join(line.split()).lower())
+
+
+def edges(text):
+    lines = [line for line in text.splitlines() if line.strip()]
+    return lines[:EDGE_LINES] + lines[-EDGE_LINES:]
+
+
+def page_furniture(texts):
+    counts = Counter()
+    for text in texts:
+        counts.update({edge_key(line) for line in edges(text)})
+    threshold = max(MIN_FURNITURE_PAGES, FURNITURE_SHARE * len(texts))
+    return {key for key, count in counts.items() if count >= threshold}
+
+
+def strip_furniture(text, furniture):
+    # Pages without headers come out exactly as from PyPDFLoader, so their chunk ids are unchanged.
+    if not furniture:
+        return text.strip()
+    lines = text.splitlines()
+    # Top of the page, then (reversed) the bottom.
+    for _ in range(2):
+        stripped = 0
+        while lines and stripped < EDGE_LINES:
+            if not lines[0].strip():
+                lines.pop(0)
+            elif edge_key(lines[0]) in furniture:
+                lines.pop(0)
+                stripped += 1
+            else:
+                break
+        lines.reverse()
+    return "\n".join(lines).strip()
+
+
+def load_pages(pdf_path, workers=PDF_WORKERS, cache_dir=PAGE_CACHE_DIR, pdf_hash=None):
+    # Drop-in for PyPDFLoader(pdf_path).load(): one Document per page with source / page /
+    # page_label / total_pages metadata.
+    pages = cached_pages(pdf_path, workers, cache_dir, pdf_hash)
+    furniture = page_furniture([text for _, text in pages])
+    return [
+        Document(
+            page_content=strip_furniture(text, furniture),
+            metadata={"source": pdf_path, "total_pages": len(pages), "page": number, "page_label": label},
+        )
+        for number, (label, text) in enumerate(pages)
+    ]
@@ -0,0 +1,269 @@
+from config import SECTION_PROMPT_TOP_K
+from crossref import format_lookup
+from sections import format_sections
+from tokens import count_tokens
+from tracing import Trace
+
+DEFAULT_TOP_K = 4
+
+
+# Single-pass retrieve-then-generate.
+# create_retrieval_chain embeds the raw query and searches FAISS again, throwing away
+# the rephrased retrieval. Here the rephrased query is embedded once, FAISS is searched
+# once and those exact documents are handed to the stuff-documents chain.
+#
+# With an AnswerCache, an exact repeat of the question returns before the rephrase, and a
+# rephrased query whose embedding is close to a cached one returns before search and generation.
+#
+# The rephraser (rephrase.Rephraser) may answer from its memo or skip the LLM for formal
+# queries; skip_rephrase overrides that choice per request.
+#
+# With a SectionIndex, the section titles closest to the query vector are picked for the
+# prompt's {sections} slot, reusing the query embedding already computed for FAISS.
+#
+# With a HybridRetriever, a query naming a section ("what is section 115") is answered from
+# that section's chunks without rephrasing or embedding, and every other query is searched
+# with BM25 (raw and rephrased text) and FAISS, fused by reciprocal rank.
+#
+# With a CrossReference, a question citing an IPC section number ("IPC 323 in BNS?") is
+# answered from the precomputed IPC -> BNS table, without the LLM. Sections the table leaves
+# unresolved go through the normal path.
+#
+# With a Reranker, search over-fetches reranker.candidates chunks and the cross-encoder picks
+# and orders the best of them for the rephrased query.
+#
+# With a Speculator, a question the LLM has to rephrase is embedded and searched as written
+# while the rephrase runs; the rephrased search then reuses or merges those results.
+#
+# With a ContextAssembler, retrieval fetches assembler.candidates chunks instead of k, and the
+# assembler keeps those that fit its token budget, best first and without repeated overlaps.
+#
+# Every stage runs inside a span of result["trace"] (tracing.Trace); the trace is finished,
+# logged and counted in the metrics once the answer is complete.
+def retrieve(query, rephraser, db, k=DEFAULT_TOP_K, cache=None, skip_rephrase=None, section_index=None,
+             hybrid=None, assembler=None, reranker=None, crossref=None, speculator=None):
+    timings = {}
+    trace = Trace(timings)
+    result = {
+        "answer": None,
+        "rephrased_query": None,
+        "rephrase": None,
+        "query_vector": None,
+        "documents": [],
+        "sections": [],
+        "timings": timings,
+        "trace": trace,
+        "cache": "miss",
+    }
+
+    if cache is not None:
+        with trace.span("cache", level="exact") as span:
+            answer = cache.get_exact(query)
+            span["hit"] = answer is not None
+        if answer is not None:
+            result.update(answer=answer, cache="exact")
+            return result
+
+    if crossref is not None:
+        with trace.span("crossref") as span:
+            match = crossref.lookup(query)
+            span["hit"] = match is not None
+        if match is not None:
+            result.update(answer=format_lookup(match), rephrase="crossref")
+            if section_index is not None:
+                numbers = [bns["number"] for bns in match["matches"]]
+                result["sections"] = [
+                    section_index.by_number[int(number)]
+                    for number in numbers if number.isdigit() and int(number) in section_index.by_number
+                ]
+            return result
+
+    if hybrid is not None:
+        with trace.span("lookup") as span:
+            documents = hybrid.lookup_section(query)
+            span["documents"] = len(documents)
+        if documents:
+            result.update(documents=documents, rephrase="section")
+            number = documents[0].metadata["section"]
+            if section_index is not None and number.isdigit() and int(number) in section_index.by_number:
+                result["sections"] = [section_index.by_number[int(number)]]
+            return assemble_context(query, result, assembler)
+
+    if assembler is not None:
+        k = assembler.candidates
+    fetch = reranker.candidates if reranker is not None else k
+
+    speculative = None
+    if speculator is not None and rephraser.needs_llm(query, skip_rephrase):
+        pending = speculator.submit(traced_rephrase, trace, rephraser, query, skip_rephrase)
+        with trace.span("speculate", k=fetch) as span:
+            raw_vector = db.embeddings.embed_query(query)
+            speculative = search(db, hybrid, query, raw_vector, fetch)
+            raw_keywords = hybrid.keyword_search(query, fetch) if hybrid is not None else None
+            span["documents"] = len(speculative)
+        rephrased_query, rephrase_path = pending.result()
+    else:
+        rephrased_query, rephrase_path = traced_rephrase(trace, rephraser, query, skip_rephrase)
+    result.update(rephrased_query=rephrased_query, rephrase=rephrase_path)
+
+    # BM25 on the rephrase is a probe that needs no embedding; if it finds what BM25 found for
+    # the raw question, the raw results and vector stand in for the rephrased ones.
+    reused = False
+    if speculative is not None and hybrid is not None:
+        with trace.span("overlap") as span:
+            probe = hybrid.keyword_search(rephrased_query, fetch)
+            reused, span["overlap"] = speculator.reuse(raw_keywords, probe)
+            span["reused"] = reused
+
+    if reused:
+        query_vector = raw_vector
+    else:
+        with trace.span("embed"):
+            query_vector = db.embeddings.embed_query(rephrased_query)
+    result["query_vector"] = query_vector
+
+    if cache is not None:
+        with trace.span("cache", level="semantic") as span:
+            answer = cache.get_semantic(query_vector)
+            span["hit"] = answer is not None
+        if answer is not None:
+            result.update(answer=answer, cache="semantic")
+            return result
+
+    with trace.span("search", k=fetch, hybrid=hybrid is not None) as span:
+        if reused:
+            documents = speculative
+        else:
+            documents = search(db, hybrid, f"{query} {rephrased_query}", query_vector, fetch)
+            if speculative is not None:
+                documents = speculator.merge(documents, speculative, fetch)
+        span["documents"] = len(documents)
+
+    if reranker is not None and documents:
+        with trace.span("rerank", candidates=len(documents)) as span:
+            ranked = reranker.rerank(rephrased_query, documents, k)
+            documents = [document for document, _ in ranked]
+            span["documents"] = len(documents)
+            span["top_score"] = ranked[0][1]
+    result["documents"] = documents
+
+    if section_index is not None:
+        with trace.span("sections"):
+            result["sections"] = section_index.top_k(query_vector, SECTION_PROMPT_TOP_K)
+
+    if not documents:
+        result["answer"] = "No relevant information found in the database."
+    return assemble_context(query, result, assembler)
+
+
+def traced_rephrase(trace, rephraser, query, skip_rephrase):
+    with trace.span("rephrase") as span:
+        rephrased_query, rephrase_path = rephraser.rephrase(query, skip=skip_rephrase)
+        span["path"] = rephrase_path
+    return rephrased_query, rephrase_path
+
+
+def search(db, hybrid, text, query_vector, k):
+    if hybrid is not None:
+        return hybrid.search(text, query_vector, k=k)
+    return db.similarity_search_by_vector(query_vector, k=k)
+
+
+def assemble_context(query, result, assembler):
+    if assembler is None or not result["documents"]:
+        return result
+    with result["trace"].span("context", candidates=len(result["documents"]), budget=assembler.budget) as span:
+        result["documents"], span["context_tokens"] = assembler.assemble(
+            result["documents"], query, format_sections(result["sections"])
+        )
+        span["documents"] = len(result["documents"])
+    return result
+
+
+def generation_inputs(query, result):
+    return {"input": query, "context": result["documents"], "sections": format_sections(result["sections"])}
+
+
+# Builds the generation inputs inside a "prompt" span carrying estimated token counts
+# (the answer template itself is not included).
+def traced_generation_inputs(query, result):
+    with result["trace"].span("prompt") as span:
+        inputs = generation_inputs(query, result)
+        span["documents"] = len(inputs["context"])
+        span["context_tokens"] = sum(count_tokens(document.page_content) for document in inputs["context"])
+        span["sections_tokens"] = count_tokens(inputs["sections"])
+        span["query_tokens"] = count_tokens(query)
+        span["prompt_tokens"] = span["context_tokens"] + span["sections_tokens"] + span["query_tokens"]
+    return inputs
+
+
+def finish_trace(result):
+    result["trace"].finish(cache=result["cache"], rephrase=result["rephrase"])
+
+
+def run_pipeline(query, rephraser, db, document_chain, k=DEFAULT_TOP_K, cache=None, skip_rephrase=None,
+                 section_index=None, hybrid=None, assembler=None, reranker=None, crossref=None,
+                 speculator=None):
+    result = retrieve(
+        query, rephraser, db, k, cache, skip_rephrase, section_index, hybrid, assembler, reranker, crossref,
+        speculator,
+    )
+    timings = result["timings"]
+
+    if result["answer"] is None:
+        inputs = traced_generation_inputs(query, result)
+        with result["trace"].span("generate") as span:
+            result["answer"] = document_chain.invoke(inputs)
+            span["answer_tokens"] = count_tokens(result["answer"])
+        span["tokens_per_second"] = span["answer_tokens"] / span["duration"] if span["duration"] else None
+        if cache is not None:
+            cache.put(query, result["query_vector"], result["answer"])
+
+    # Not the sum of the stages: with a Speculator, the rephrase and the raw search overlap.
+    timings["total"] = result["trace"].elapsed()
+    finish_trace(result)
+    return result
+
+
+# Same as run_pipeline, but generation is left to result["stream"], a generator yielding
+# answer tokens as the LLM produces them. Timings (including time to first token) and
+# result["answer"] are filled in once the stream is exhausted.
+def stream_pipeline(query, rephraser, db, document_chain, k=DEFAULT_TOP_K, cache=None, skip_rephrase=None,
+                    section_index=None, hybrid=None, assembler=None, reranker=None, crossref=None,
+                    speculator=None):
+    result = retrieve(
+        query, rephraser, db, k, cache, skip_rephrase, section_index, hybrid, assembler, reranker, crossref,
+        speculator,
+    )
+    timings = result["timings"]
+    trace = result["trace"]
+
+    def stream():
+        if result["answer"] is not None:
+            timings["first_token"] = trace.elapsed()
+            yield result["answer"]
+        else:
+            inputs = traced_generation_inputs(query, result)
+            tokens = []
+            with trace.span("generate") as span:
+                for token in document_chain.stream(inputs):
+                    if not tokens:
+                        timings["first_token"] = span["first_token"] = trace.elapsed()
+                    tokens.append(token)
+                    yield token
+                result["answer"] = "".join(tokens)
+                span["answer_tokens"] = count_tokens(result["answer"])
+            # Tokens per second after the first one arrives, i.e. decoding speed.
+            decoding = trace.elapsed() - timings.get("first_token", 0.0)
+            span["tokens_per_second"] = span["answer_tokens"] / decoding if tokens and decoding > 0 else None
+            if cache is not None:
+                cache.put(query, result["query_vector"], result["answer"])
+        timings["total"] = trace.elapsed()
+        finish_trace(result)
+
+    result["stream"] = stream()
+    return result
+
+
+def format_timings(timings):
+    return " | ".join(f"{stage}: {seconds * 1000:.0f} ms" for stage, seconds in timings.items())
@@ -0,0 +1,109 @@
+# Prompt texts shared by main.py, final.py and the service.
+
+# Answer prompt used by main.py. {sections} holds only the BNS section titles closest to
+# the query (see sections.SectionIndex), not the whole arrangement of 358 sections.
+ANSWER_TEMPLATE_WITH_SECTION_LIST = """
+BNS Section LIST:=
+{sections}
+
+You are an Expert Legal Advisor and you have to answer Bhartiya Nyay Sanhita Sections.
+Answer the following question based only on the provided context. 
+Think step by step before providing a detailed answer. 
+I will tip you $1000 if the user finds the answer helpful. 
+<context>
+{context}
+</context>
+Question: {input}
+"""
+
+# Shorter answer prompt used by the Streamlit app (final.py).
+ANSWER_TEMPLATE = """
+    You are an Expert Legal Advisor and you have to answer Bhartiya Nyay Sanhita Sections. Don't use Indian Penal Code (IPC) sections.
+    Answer the following question based only on the provided context. 
+    Think step by step before providing a detailed answer. 
+    I will tip you $1000 if the user finds the answer helpful. 
+    <context>
+    {context}
+    </context>
+    Question: {input}
+    """
+
+REPHRASE_TEMPLATE = """
+    You are an expert legal translator, well-versed in the language and structure of Indian legal codes, particularly the Bhartiya Nyaya Sanhita (BNS). Your task is to transform informal descriptions of incidents or legal issues into formal, precise legal language that aligns closely with the terminology found in official legal documents.
+
+    User Query = {query}
+
+    Your task:
+    1. Analyze the user's input to identify the core legal issues or relevant actions described.
+    2. Translate the key elements of the situation into formal legal terminology, using language that would be found in the Bhartiya Nyaya Sanhita (BNS).
+    3. Structure the output as a concise, single-sentence statement that encapsulates the legal essence of the situation.
+    4. Ensure that the resulting statement uses terms and phrasings that are likely to appear in official legal documents, facilitating easier matching with relevant sections of the law.
+    5. Avoid including specific names, dates, or locations in the output. Focus on the actions, intentions, and consequences described.
+    6. Don't give me any sections. Just give me the sentence in and bridges the gap between colloquial descriptions and formal legal language.
+    7. Don't add the IPC Sections
+
+    Example input: "My neighbor's dog bit me when I was walking on the sidewalk in front of their house."
+
+    Example output: "The incident involves the infliction of physical injury by a domesticated animal upon a person lawfully present in a public space adjacent to the animal owner's property."
+
+    Remember: Your goal is to produce a statement that bridges the gap between colloquial descriptions and formal legal language, facilitating more accurate identification of relevant legal statutes and precedents.
+
+    Return only the rephrased sentence without any additional information or formatting.
+    """
+
+# final.py's variant, written from the point of view of a senior lawyer.
+SENIOR_LAWYER_REPHRASE_TEMPLATE = """
+    You are an expert legal translator,senior lawyer with having 20 years of experience in Indian Courts, well-versed in the language and structure of Indian legal codes, particularly the Bhartiya Nyaya Sanhita (BNS). Your task is to transform informal descriptions of incidents or legal issues into formal, precise legal language that aligns closely with the terminology found in official legal documents.
+
+    User Query = {query}
+
+    Your task:
+    1. Analyze the user's input to identify the core legal issues or relevant actions described.
+    2. Translate the key elements of the situation into formal legal terminology, using language that would be found in the Bhartiya Nyaya Sanhita (BNS).
+    3. Structure the output as a concise, single-sentence statement that encapsulates the legal essence of the situation.
+    4. Ensure that the resulting statement uses terms and phrasings that are likely to appear in official legal documents, facilitating easier matching with relevant sections of the law.
+    5. Avoid including specific names, dates, or locations in the output. Focus on the actions, intentions, and consequences described.
+    6. Don't give me any IPC sections. 
+    7. Just give me the sentence in and bridges the gap between colloquial descriptions and formal legal language.
+
+
+    Example input: "A person stole my bicycle from the front yard while I was inside my house."
+
+    Example output:  "The incident involves the unlawful taking of personal property from a person's premises without consent, constituting the crime of theft."
+
+    Remember: Your goal is to produce a statement that bridges the gap between colloquial descriptions and formal legal language, facilitating more accurate identification of relevant legal statutes and precedents.
+
+    Return only the rephrased sentence without any additional information or formatting.
+    """
+
+# FIR drafting (fir.py). One call per part of the form; {fields} lists that part's fields
+# with a hint each, and the reply is parsed line by line as "Field: value".
+FIR_PART_TEMPLATE = """
+You are helping a police officer in India draft a First Information Report (FIR) from a complaint.
+Fill in the "{part}" part of the FIR form using only facts stated in the complaint.
+Write "Not stated" for anything the complaint does not say. Do not invent names, dates, numbers or places.
+
+Reply with exactly one line per field, in this order, formatted as "Field: value", and nothing else:
+{fields}
+
+Complaint:
+{narrative}
+"""
+
+# The applicable-sections part also gets the retrieved BNS text and the closest section titles.
+FIR_SECTIONS_TEMPLATE = """
+You are an Expert Legal Advisor drafting the "Applicable BNS Sections" entry of a First Information Report.
+Use only the Bharatiya Nyaya Sanhita (BNS) sections in the context below. Don't use Indian Penal Code (IPC) sections.
+
+BNS Section LIST:=
+{sections}
+
+<context>
+{context}
+</context>
+
+Complaint:
+{narrative}
+
+Reply with one line per applicable section, formatted as "Section <number> - <title>: <one-sentence reason>", and nothing else.
+"""
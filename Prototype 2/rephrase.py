@@ -0,0 +1,153 @@
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from langchain.chains import LLMChain
+
+from answer_cache import normalize_query
+from config import (
+    FORMAL_QUERY_THRESHOLD, REPHRASE_MEMO_FLUSH, REPHRASE_MEMO_PATH, REPHRASE_MEMO_SIZE, REPHRASE_MEMO_TTL,
+)
+
+# Words that carry no legal meaning; ignored when building the vocabulary and scoring queries.
+STOP_WORDS = {
+    "that", "this", "with", "from", "have", "been", "which", "shall", "such", "whoever", "there",
+    "their", "they", "them", "then", "than", "into", "upon", "under", "were", "where", "when",
+    "what", "also", "other", "said", "same", "only", "does", "being", "would", "could", "should",
+}
+
+# Conversational markers: a query containing any of these is not already formal.
+INFORMAL_WORDS = {
+    "i", "me", "my", "mine", "we", "our", "us", "you", "your", "he", "she", "his", "her",
+    "tell", "please", "pls", "plz", "guy", "friend", "bro", "help", "hitted",
+}
+
+WORD_PATTERN = re.compile(r"[a-z]+")
+
+
+def build_vocabulary(texts):
+    vocabulary = set()
+    for text in texts:
+        for word in WORD_PATTERN.findall(text.lower()):
+            if len(word) >= 4 and word not in STOP_WORDS:
+                vocabulary.add(word)
+    return vocabulary
+
+
+def formality_score(query, vocabulary):
+    words = WORD_PATTERN.findall(query.lower())
+    if not words or any(word in INFORMAL_WORDS for word in words):
+        return 0.0
+    content = [word for word in words if len(word) >= 4 and word not in STOP_WORDS]
+    if len(content) < 3:
+        return 0.0
+    return sum(word in vocabulary for word in content) / len(content)
+
+
+class Rephraser:
+    # Rewrites user queries in formal BNS language before retrieval.
+    # The LLM chain is built once. Results are memoised on disk by normalised query, and
+    # queries that already read like statute text (scored against the BNS vocabulary)
+    # skip the LLM entirely. rephrase() reports which of the three paths was taken.
+    # Like the answer cache, the memo is LRU-ordered and TTL-bounded; new entries are
+    # written in batches of `flush_every` (and at exit), not one file rewrite per query.
+
+    def __init__(self, llm, prompt, vocabulary=(), memo_path=REPHRASE_MEMO_PATH, threshold=FORMAL_QUERY_THRESHOLD,
+                 max_entries=REPHRASE_MEMO_SIZE, ttl=REPHRASE_MEMO_TTL, flush_every=REPHRASE_MEMO_FLUSH):
+        self.chain = LLMChain(llm=llm, prompt=prompt)
+        self.vocabulary = set(vocabulary)
+        self.memo_path = memo_path
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.flush_every = flush_every
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.unsaved = 0
+        # A different prompt or model would rephrase differently, so it gets a fresh memo.
+        model = getattr(llm, "model", type(llm).__name__)
+        self.memo_key = hashlib.sha256(f"{model}\0{prompt.template}".encode("utf-8")).hexdigest()
+        self.memo = OrderedDict()
+        self._load_memo()
+        if memo_path:
+            atexit.register(self.flush)
+
+    def _load_memo(self):
+        if not self.memo_path or not os.path.exists(self.memo_path):
+            return
+        with open(self.memo_path, encoding="utf-8") as f:
+            data = json.load(f)
+        # Memos written before entries carried a timestamp are dropped like a stale key.
+        if data.get("key") != self.memo_key or "entries" not in data:
+            return
+        for key, entry in data["entries"]:
+            self.memo[key] = entry
+        self._expire()
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl
+        for key in [key for key, entry in self.memo.items() if entry["created"] < cutoff]:
+            del self.memo[key]
+        while len(self.memo) > self.max_entries:
+            self.memo.popitem(last=False)
+
+    def _lookup(self, key):
+        # Caller holds the lock.
+        entry = self.memo.get(key)
+        if entry is None or entry["created"] < time.time() - self.ttl:
+            return None
+        return entry
+
+    def flush(self):
+        # Writes the memo if it has unsaved entries. The snapshot is taken under the lock;
+        # the file is written outside it, so lookups never wait on disk.
+        if not self.memo_path:
+            return
+        with self.write_lock:
+            with self.lock:
+                if not self.unsaved:
+                    return
+                self.unsaved = 0
+                entries = list(self.memo.items())
+            tmp_path = self.memo_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"key": self.memo_key, "entries": entries}, f)
+            os.replace(tmp_path, self.memo_path)
+
+    def is_formal(self, query):
+        return formality_score(query, self.vocabulary) >= self.threshold
+
+    def needs_llm(self, query, skip=None):
+        # Whether rephrase() would call the LLM (no skip, no memo entry).
+        if skip or (skip is None and self.is_formal(query)):
+            return False
+        with self.lock:
+            return self._lookup(normalize_query(query)) is None
+
+    def rephrase(self, query, skip=None):
+        # skip=True forces the raw query through, skip=False forces the LLM (memo still applies).
+        if skip or (skip is None and self.is_formal(query)):
+            return query.strip(), "skipped"
+
+        key = normalize_query(query)
+        with self.lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.memo.move_to_end(key)
+                return entry["text"], "memo"
+
+        rephrased = self.chain.invoke({"query": query})["text"].strip()
+        with self.lock:
+            self.memo[key] = {"text": rephrased, "created": time.time()}
+            self.memo.move_to_end(key)
+            self._expire()
+            self.unsaved += 1
+            due = self.unsaved >= self.flush_every
+        if due:
+            self.flush()
+        return rephrased, "llm"
@@ -0,0 +1,81 @@
+import threading
+from collections import OrderedDict
+
+from answer_cache import normalize_query
+from config import RERANK_CACHE_SIZE, RERANK_CANDIDATES, RERANK_CUTOFF_MARGIN, RERANKER_MODEL
+from hybrid import chunk_key
+
+# Optional second stage between search and the prompt: a cross-encoder reads the query and
+# each candidate chunk together and scores how well the chunk answers it, which catches the
+# loosely worded questions where the first-stage top hit is the wrong section.
+#
+# Retrieval over-fetches RERANK_CANDIDATES chunks; every (query, chunk) pair not already in
+# the score cache goes through the model in a single batched forward pass, and the chunks
+# come back best first. Candidates scoring more than RERANK_CUTOFF_MARGIN below the best one
+# are cut, so when the top chunk clearly dominates the prompt carries only that chunk.
+
+
+def load_cross_encoder(model=RERANKER_MODEL):
+    # ms-marco cross-encoders output raw logits; the sigmoid puts them in [0, 1], the scale
+    # RERANK_CUTOFF_MARGIN is given in.
+    import torch
+    from sentence_transformers import CrossEncoder
+
+    return CrossEncoder(model, device="cpu", activation_fn=torch.nn.Sigmoid())
+
+
+class Reranker:
+    # `model` needs a CrossEncoder-style predict(pairs, batch_size=...) returning one score per
+    # pair; scores are expected in [0, 1] (load_cross_encoder adds the sigmoid that
+    # cross-encoder/ms-marco-MiniLM-L-6-v2 and similar models do not apply themselves).
+
+    def __init__(self, model, candidates=RERANK_CANDIDATES, margin=RERANK_CUTOFF_MARGIN,
+                 cache_size=RERANK_CACHE_SIZE):
+        self.model = model
+        self.candidates = candidates
+        self.margin = margin
+        self.cache_size = cache_size
+        self.scores = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {"scored": 0, "cached": 0, "cut": 0}
+
+    def _score(self, pairs):
+        keys = [(normalize_query(query), chunk_key(document)) for query, document in pairs]
+        known = {}
+        missing = {}
+        with self.lock:
+            for key, (query, document) in zip(keys, pairs):
+                if key in self.scores:
+                    self.scores.move_to_end(key)
+                    known[key] = self.scores[key]
+                elif key not in missing:
+                    missing[key] = (query, document.page_content)
+            self.stats["cached"] += len(pairs) - len(missing)
+        if missing:
+            texts = list(missing.values())
+            computed = self.model.predict(texts, batch_size=len(texts), show_progress_bar=False)
+            known.update(zip(missing, map(float, computed)))
+            with self.lock:
+                for key in missing:
+                    self.scores[key] = known[key]
+                while len(self.scores) > self.cache_size:
+                    self.scores.popitem(last=False)
+                self.stats["scored"] += len(missing)
+        return [known[key] for key in keys]
+
+    def rerank_many(self, queries, candidate_lists, k):
+        # All queries' candidates are scored in one forward pass. Returns, per query, up to k
+        # (document, score) pairs, best first, cut at RERANK_CUTOFF_MARGIN below the best.
+        pairs = [(query, document) for query, documents in zip(queries, candidate_lists) for document in documents]
+        scores = iter(self._score(pairs))
+        results = []
+        for documents in candidate_lists:
+            ranked = sorted(zip(documents, scores), key=lambda item: item[1], reverse=True)[:k]
+            kept = [item for item in ranked if item[1] >= ranked[0][1] - self.margin] if ranked else []
+            with self.lock:
+                self.stats["cut"] += len(ranked) - len(kept)
+            results.append(kept)
+        return results
+
+    def rerank(self, query, documents, k):
+        return self.rerank_many([query], [documents], k)[0]
@@ -0,0 +1,161 @@
+import re
+
+from langchain_core.documents import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+# Structure-aware chunking of statute PDFs: one chunk per section, or per group of
+# sub-sections when a section is too long, with no overlap and with page numbers and
+# other layout noise removed. Each chunk carries act, section, title, chapter and the
+# pages it spans.
+
+# "115. Voluntarily causing hurt.—(1) Whoever ...", "255.—Public servant ...", "171A. Bribery.- ..."
+SECTION_START = re.compile(r"^(\d{1,3})([A-Z]{0,2})\.(?=\s*\S)(.*)$")
+TITLE_END = re.compile(r"\s*\.?\s*(?:—|––|–|-\s|-$|\.-)")
+CHAPTER_LINE = re.compile(r"^CHAPTER\s*-?\s*([IVXL]+[A-Z]?)$")
+SUBSECTION_START = re.compile(r"^\((\d+)\)")
+# Numbering gaps larger than this (repealed sections) are treated as noise, not as a new section.
+MAX_SECTION_GAP = 10
+
+
+def clean_lines(text):
+    lines = []
+    for raw in text.splitlines():
+        line = " ".join(raw.split())
+        # Page numbers, blank lines and separator rules.
+        if not line or line.isdigit() or set(line) <= {"_", "-"}:
+            continue
+        lines.append(line)
+    return lines
+
+
+def is_next_section(number, suffix, last_number, last_suffix):
+    if number == last_number:
+        return suffix > last_suffix
+    return last_number < number <= last_number + MAX_SECTION_GAP
+
+
+def looks_like_arrangement(sections):
+    return bool(sections) and sum(len(section["lines"]) for section in sections) / len(sections) < 3
+
+
+class SectionTextSplitter:
+    # Same split_documents() interface as LangChain's splitters. Falls back to plain
+    # character splitting when no numbered sections are found in the document.
+
+    def __init__(self, max_chars=2000):
+        self.max_chars = max_chars
+        self.fallback = RecursiveCharacterTextSplitter(chunk_size=max_chars, chunk_overlap=0)
+
+    def find_sections(self, pages):
+        sections = []
+        current = None
+        chapter = None
+        chapter_title = ""
+        expecting_chapter_title = False
+        last = (0, "")
+        restarted = False
+
+        for page in pages:
+            page_number = page.metadata.get("page", 0)
+            for line in clean_lines(page.page_content):
+                match = CHAPTER_LINE.match(line)
+                if match:
+                    chapter = match.group(1)
+                    chapter_title = ""
+                    expecting_chapter_title = True
+                    continue
+                if expecting_chapter_title and line.isupper():
+                    chapter_title = f"{chapter_title} {line}".strip()
+                    continue
+                expecting_chapter_title = False
+
+                match = SECTION_START.match(line)
+                if match:
+                    number, suffix = int(match.group(1)), match.group(2)
+                    # Numbering restarts at 1 once, where the arrangement of sections at the front
+                    # (one or two lines per entry) gives way to the enacting text.
+                    if number == 1 and last[0] > 1 and not restarted and looks_like_arrangement(sections):
+                        sections, current, last, restarted = [], None, (0, ""), True
+                    if is_next_section(number, suffix, *last):
+                        last = (number, suffix)
+                        rest = match.group(3).strip(" .—–-")
+                        current = {
+                            "section": f"{number}{suffix}",
+                            "title": TITLE_END.split(rest, 1)[0].strip()[:200],
+                            "chapter": chapter,
+                            "chapter_title": chapter_title,
+                            "page_start": page_number,
+                            "page_end": page_number,
+                            "lines": [line],
+                        }
+                        sections.append(current)
+                        continue
+
+                if current is not None:
+                    current["lines"].append(line)
+                    current["page_end"] = page_number
+
+        return sections
+
+    def _section_chunks(self, section):
+        text = "\n".join(section["lines"])
+        if len(text) <= self.max_chars:
+            return [(text, None)]
+
+        # Group consecutive sub-sections ("(1) ...", "(2) ...") up to max_chars.
+        groups = []
+        for line in section["lines"]:
+            match = SUBSECTION_START.match(line)
+            if match or not groups:
+                groups.append({"subsection": match.group(1) if match else None, "lines": [line]})
+            else:
+                groups[-1]["lines"].append(line)
+
+        chunks = []
+        buffer = []
+        first = None
+        for group in groups:
+            group_text = "\n".join(group["lines"])
+            if buffer and len("\n".join(buffer)) + len(group_text) > self.max_chars:
+                chunks.append(("\n".join(buffer), first))
+                buffer, first = [], None
+            buffer.append(group_text)
+            first = first or group["subsection"]
+        if buffer:
+            chunks.append(("\n".join(buffer), first))
+
+        split = []
+        for chunk_text, subsection in chunks:
+            if len(chunk_text) <= self.max_chars:
+                split.append((chunk_text, subsection))
+            else:
+                split.extend((piece, subsection) for piece in self.fallback.split_text(chunk_text))
+        return split
+
+    def split_documents(self, pages):
+        sections = self.find_sections(pages)
+        if not sections:
+            return self.fallback.split_documents(pages)
+
+        base_metadata = {key: value for key, value in pages[0].metadata.items() if key not in ("page", "page_label")}
+        documents = []
+        for section in sections:
+            heading = f"Section {section['section']}. {section['title']}"
+            for text, subsection in self._section_chunks(section):
+                metadata = dict(base_metadata)
+                metadata.update({
+                    "section": section["section"],
+                    "title": section["title"],
+                    "chapter": section["chapter"],
+                    "chapter_title": section["chapter_title"],
+                    "page": section["page_start"],
+                    "page_start": section["page_start"],
+                    "page_end": section["page_end"],
+                })
+                if subsection is not None:
+                    metadata["subsection"] = subsection
+                # Continuation chunks of a long section still say which section they belong to.
+                if not text.startswith(f"{section['section']}."):
+                    text = f"{heading}\n{text}"
+                documents.append(Document(page_content=text, metadata=metadata))
+        return documents
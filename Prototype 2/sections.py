@@ -0,0 +1,116 @@
+import json
+import os
+import re
+
+import numpy as np
+from pypdf import PdfReader
+
+from pdf_pages import file_sha256
+
+# Structured index of BNS sections (number, title, chapter) parsed from the
+# "ARRANGEMENT OF SECTIONS" pages at the start of bns.pdf. The answer prompt gets only
+# the titles closest to the query instead of the whole table of contents.
+
+SECTION_LINE = re.compile(r"^(\d{1,3})\.\s+(.*)$")
+CHAPTER_LINE = re.compile(r"^CHAPTER\s+([IVXL]+[A-Z]?)$")
+ACT_TITLE_LINE = re.compile(r"^THE [A-Z ]+, \d{4}$")
+
+
+def parse_arrangement(lines):
+    sections = []
+    chapter = None
+    chapter_title = None
+    expecting_chapter_title = False
+
+    for raw in lines:
+        line = " ".join(raw.split())
+        if not line or line.isdigit() or line == "SECTIONS" or set(line) == {"_"}:
+            continue
+
+        # The enacting text of the Act follows the arrangement under its full title.
+        if sections and ACT_TITLE_LINE.match(line):
+            break
+
+        match = CHAPTER_LINE.match(line)
+        if match:
+            chapter = match.group(1)
+            chapter_title = ""
+            expecting_chapter_title = True
+            continue
+
+        match = SECTION_LINE.match(line)
+        if match:
+            number = int(match.group(1))
+            # The body of the Act restarts at section 1; the arrangement is over.
+            if sections and number <= sections[-1]["number"]:
+                break
+            sections.append({
+                "number": number,
+                "title": match.group(2).strip(),
+                "chapter": chapter,
+                "chapter_title": chapter_title,
+            })
+            expecting_chapter_title = False
+            continue
+
+        if expecting_chapter_title and line.isupper():
+            chapter_title = f"{chapter_title} {line}".strip()
+            for section in sections:
+                if section["chapter"] == chapter:
+                    section["chapter_title"] = chapter_title
+        elif sections and not expecting_chapter_title and line[0].islower():
+            # Wrapped title ("... judgment stating that it is doubtful of" / "which.").
+            sections[-1]["title"] += " " + line
+        # Anything else is a sub-heading such as "Of theft"; the section titles carry the meaning.
+
+    return sections
+
+
+def parse_sections(pdf_path, max_pages=20):
+    reader = PdfReader(pdf_path)
+    lines = []
+    for page in reader.pages[:max_pages]:
+        lines.extend(page.extract_text().splitlines())
+    return parse_arrangement(lines)
+
+
+def format_section(section):
+    return f"{section['number']}. {section['title']}"
+
+
+def format_sections(sections):
+    return "\n".join(format_section(section) for section in sections)
+
+
+class SectionIndex:
+    # Section titles plus one embedding per title, cached as JSON next to the FAISS index.
+    # The cache is rebuilt when bns.pdf or the embedding model changes.
+
+    def __init__(self, sections, vectors):
+        self.sections = sections
+        self.by_number = {section["number"]: section for section in sections}
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self.vectors = matrix / np.where(norms == 0, 1, norms)
+
+    @classmethod
+    def load(cls, pdf_path, cache_path, embeddings, embedder_name):
+        pdf_hash = file_sha256(pdf_path)
+        if os.path.exists(cache_path):
+            with open(cache_path, encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached["pdf_hash"] == pdf_hash and cached["embedder"] == embedder_name:
+                return cls(cached["sections"], cached["vectors"])
+
+        sections = parse_sections(pdf_path)
+        texts = [f"{section['title']} ({section['chapter_title']})" for section in sections]
+        vectors = embeddings.embed_documents(texts)
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump({"pdf_hash": pdf_hash, "embedder": embedder_name, "sections": sections, "vectors": vectors}, f)
+        return cls(sections, vectors)
+
+    def top_k(self, query_vector, k=8):
+        query = np.asarray(query_vector, dtype=np.float32)
+        scores = self.vectors @ (query / (np.linalg.norm(query) or 1.0))
+        best = np.argsort(-scores)[:k]
+        return [self.sections[i] for i in sorted(best, key=lambda i: self.sections[i]["number"])]
@@ -0,0 +1,217 @@
+import os
+import threading
+
+from langchain_ollama import OllamaLLM
+from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
+from langchain.chains.combine_documents import create_stuff_documents_chain
+from langchain.chains import create_retrieval_chain
+
+from answer_cache import AnswerCache
+from config import (
+    ANSWER_CACHE_PATH, BNS_PDF_PATH, CROSSREF_PATH, EMBEDDING_BACKEND, EMBEDDING_MODEL, FAISS_INDEX_PATH,
+    LLM_MODEL, REPHRASE_MEMO_PATH, RERANKER_MODEL, SECTION_PROMPT_TOP_K, SPECULATIVE_RETRIEVAL, STATUTE_PDFS,
+)
+from context import ContextAssembler
+from crossref import CrossReference
+from embedding_backend import get_embeddings
+from fir import FirDrafter
+from hybrid import HybridRetriever
+from index_store import all_documents, load_index, shard_acts
+from ingest import ingest
+from pipeline import retrieve, run_pipeline, stream_pipeline
+from prompts import ANSWER_TEMPLATE_WITH_SECTION_LIST, REPHRASE_TEMPLATE
+from rephrase import Rephraser, build_vocabulary
+from rerank import Reranker, load_cross_encoder
+from sections import SectionIndex, format_sections
+from shards import ShardRouter
+from speculate import Speculator
+
+
+class LegalAidService:
+    # Owns the embedder, FAISS index, hybrid retriever, IPC -> BNS table, optional re-ranker
+    # and speculative retrieval, context assembler, LLM, chains, rephraser and answer cache.
+    # Nothing is loaded in the constructor: each component is created on first use,
+    # exactly once even when several threads ask for it at the same time.
+    # Call ready() to load everything up front (e.g. at server start).
+
+    def __init__(self, index_path=FAISS_INDEX_PATH, answer_template=ANSWER_TEMPLATE_WITH_SECTION_LIST,
+                 rephrase_template=REPHRASE_TEMPLATE, llm=None, embeddings=None, reranker=None,
+                 cache_path=ANSWER_CACHE_PATH, rephrase_memo_path=REPHRASE_MEMO_PATH, log=print):
+        self.index_path = index_path
+        self.answer_template = answer_template
+        self.rephrase_template = rephrase_template
+        self.cache_path = cache_path
+        self.rephrase_memo_path = rephrase_memo_path
+        self.log = log
+        self._components = {}
+        if llm is not None:
+            self._components["llm"] = llm
+        if embeddings is not None:
+            self._components["embeddings"] = embeddings
+        if reranker is not None:
+            self._components["reranker"] = reranker
+        # Re-entrant because building one component pulls in others (the index needs the embedder).
+        self._lock = threading.RLock()
+
+    def _get(self, name, factory):
+        value = self._components.get(name)
+        if value is None:
+            with self._lock:
+                value = self._components.get(name)
+                if value is None:
+                    value = factory()
+                    self._components[name] = value
+        return value
+
+    def _create_db(self):
+        # With per-act shards, the first default act's shard (rephrase vocabulary, embedder).
+        if shard_acts(self.index_path):
+            return self.hybrid.shard(self.hybrid.default_acts[0]).db
+        if os.path.exists(self.index_path):
+            self.log("Loading existing FAISS index...")
+            return load_index(self.index_path, self.embeddings)
+        self.log("FAISS index not found, creating embeddings...")
+        db, _ = ingest(STATUTE_PDFS, self.embeddings, self.index_path)
+        self.log("FAISS index created and saved locally.")
+        return db
+
+    def _create_hybrid(self):
+        # A ShardRouter (same interface) when the index is split per act.
+        if shard_acts(self.index_path):
+            return ShardRouter(self.index_path, self.embeddings)
+        return HybridRetriever(self.db)
+
+    def _create_rephraser(self):
+        return Rephraser(
+            self.llm,
+            PromptTemplate.from_template(self.rephrase_template),
+            vocabulary=build_vocabulary(doc.page_content for doc in all_documents(self.db)),
+            memo_path=self.rephrase_memo_path,
+        )
+
+    def _create_section_index(self):
+        return SectionIndex.load(
+            BNS_PDF_PATH,
+            os.path.join(self.index_path, "sections.json"),
+            self.embeddings,
+            f"{EMBEDDING_BACKEND}:{EMBEDDING_MODEL}",
+        )
+
+    @property
+    def embeddings(self):
+        return self._get("embeddings", get_embeddings)
+
+    @property
+    def db(self):
+        return self._get("db", self._create_db)
+
+    @property
+    def llm(self):
+        return self._get("llm", lambda: OllamaLLM(model=LLM_MODEL))
+
+    @property
+    def document_chain(self):
+        return self._get(
+            "document_chain",
+            lambda: create_stuff_documents_chain(self.llm, ChatPromptTemplate.from_template(self.answer_template)),
+        )
+
+    @property
+    def retrieval_chain(self):
+        return self._get("retrieval_chain", lambda: create_retrieval_chain(self.db.as_retriever(), self.document_chain))
+
+    @property
+    def rephraser(self):
+        return self._get("rephraser", self._create_rephraser)
+
+    @property
+    def section_index(self):
+        # Only prompts with a {sections} slot need it.
+        if "{sections}" not in self.answer_template:
+            return None
+        return self._get("section_index", self._create_section_index)
+
+    @property
+    def hybrid(self):
+        return self._get("hybrid", self._create_hybrid)
+
+    @property
+    def crossref(self):
+        # Off until the table is built (`python crossref.py --build`).
+        if not os.path.exists(CROSSREF_PATH):
+            return None
+        return self._get("crossref", CrossReference.load)
+
+    @property
+    def reranker(self):
+        # Off unless RERANKER_MODEL is set or a reranker was passed in.
+        if not RERANKER_MODEL and "reranker" not in self._components:
+            return None
+        return self._get("reranker", lambda: Reranker(load_cross_encoder(RERANKER_MODEL)))
+
+    @property
+    def speculator(self):
+        # Off unless SPECULATIVE_RETRIEVAL is set.
+        if not SPECULATIVE_RETRIEVAL:
+            return None
+        return self._get("speculator", Speculator)
+
+    @property
+    def assembler(self):
+        return self._get("assembler", lambda: ContextAssembler(self.answer_template))
+
+    @property
+    def fir_drafter(self):
+        return self._get("fir_drafter", lambda: FirDrafter(self.llm))
+
+    @property
+    def answer_cache(self):
+        return self._get("answer_cache", lambda: AnswerCache(self.cache_path, self.index_path))
+
+    def ready(self):
+        for component in ("embeddings", "db", "llm", "document_chain", "rephraser", "section_index", "hybrid",
+                          "crossref", "reranker", "speculator", "assembler", "fir_drafter", "answer_cache"):
+            getattr(self, component)
+        return self
+
+    def answer(self, query, skip_rephrase=None):
+        return run_pipeline(
+            query, self.rephraser, self.db, self.document_chain, cache=self.answer_cache,
+            skip_rephrase=skip_rephrase, section_index=self.section_index, hybrid=self.hybrid,
+            assembler=self.assembler, reranker=self.reranker, crossref=self.crossref,
+            speculator=self.speculator,
+        )
+
+    def stream(self, query, skip_rephrase=None):
+        return stream_pipeline(
+            query, self.rephraser, self.db, self.document_chain, cache=self.answer_cache,
+            skip_rephrase=skip_rephrase, section_index=self.section_index, hybrid=self.hybrid,
+            assembler=self.assembler, reranker=self.reranker, crossref=self.crossref,
+            speculator=self.speculator,
+        )
+
+    # FIR mode: the narrative is searched as written (no rephrase, no answer cache), then
+    # the drafter streams (part, field, value) for each field of the FIR form.
+    def stream_fir(self, narrative):
+        result = retrieve(
+            narrative, self.rephraser, self.db, skip_rephrase=True, section_index=self.section_index,
+            hybrid=self.hybrid, assembler=self.assembler, reranker=self.reranker,
+        )
+        return self.fir_drafter.stream(narrative, result["documents"], result["sections"])
+
+    # The original two-retrieval path (similarity_search on the rephrased query, then
+    # create_retrieval_chain searching again on the raw query), kept for comparison. The
+    # prompt's {sections} slot gets the section titles closest to the raw query.
+    def answer_legacy(self, query):
+        rephrased_query, _ = self.rephraser.rephrase(query, skip=False)
+        result = self.db.similarity_search(rephrased_query)
+        if not result:
+            return "No relevant information found in the database."
+        context = result[0].page_content
+        sections = []
+        if self.section_index is not None:
+            sections = self.section_index.top_k(self.embeddings.embed_query(query), SECTION_PROMPT_TOP_K)
+        response = self.retrieval_chain.invoke(
+            {"input": query, "context": context, "sections": format_sections(sections)}
+        )
+        return response.get('answer', 'No answer was generated.')
@@ -0,0 +1,93 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import DEFAULT_ACTS, EMBEDDING_BACKEND, EMBEDDING_MODEL
+from hybrid import HybridRetriever, act_pattern, reciprocal_rank_fusion
+from index_store import load_index, shard_acts, shard_path
+
+# One index per act (faiss_index/bns, faiss_index/ipc, ...), built with `python ingest.py --shards`.
+#
+# ShardRouter has the HybridRetriever interface, so the pipeline and batch runner use it
+# unchanged. A question that names an act ("section 302 IPC", "under the Indian Penal Code")
+# is searched in that act's shard only; any other question in the DEFAULT_ACTS shards. When
+# several shards are searched, they are searched in parallel and their rankings fused.
+# A shard (vectors, docstore, BM25, section table) is loaded the first time it is searched,
+# so memory grows with the acts actually asked about, not with the acts indexed.
+
+
+class ShardRouter:
+
+    def __init__(self, index_path, embeddings, default_acts=DEFAULT_ACTS, backend=EMBEDDING_BACKEND,
+                 model=EMBEDDING_MODEL):
+        self.index_path = index_path
+        self.embeddings = embeddings
+        self.backend = backend
+        self.model = model
+        self.acts = shard_acts(index_path)
+        if not self.acts:
+            raise ValueError(f"{index_path} has no per-act shards; build them with `python ingest.py --shards`.")
+        if "*" in default_acts:
+            self.default_acts = list(self.acts)
+        else:
+            self.default_acts = [act for act in default_acts if act in self.acts] or self.acts[:1]
+        self.patterns = {act: act_pattern(act) for act in self.acts}
+        self.pool = ThreadPoolExecutor(max_workers=len(self.acts))
+        self._shards = {}
+        self._lock = threading.Lock()
+
+    def shard(self, act):
+        retriever = self._shards.get(act)
+        if retriever is None:
+            with self._lock:
+                retriever = self._shards.get(act)
+                if retriever is None:
+                    db = load_index(shard_path(self.index_path, act), self.embeddings, self.backend, self.model)
+                    retriever = HybridRetriever(db, act=act)
+                    self._shards[act] = retriever
+        return retriever
+
+    @property
+    def loaded(self):
+        return list(self._shards)
+
+    def route(self, query):
+        named = [act for act, pattern in self.patterns.items() if pattern.search(query)]
+        return named or self.default_acts
+
+    def lookup_section(self, query):
+        for act in self.route(query):
+            documents = self.shard(act).lookup_section(query)
+            if documents:
+                return documents
+        return []
+
+    def keyword_search(self, query_text, k=20):
+        rankings = [self.shard(act).keyword_search(query_text, k) for act in self.route(query_text)]
+        return rankings[0] if len(rankings) == 1 else reciprocal_rank_fusion(rankings, k)
+
+    def search(self, query_text, query_vector, k=4, candidates=20):
+        return self.search_many([query_text], [query_vector], k, candidates)[0]
+
+    def search_many(self, query_texts, query_vectors, k=4, candidates=20):
+        # Queries are grouped by shard, so each shard gets one matrix search for its group.
+        groups = {}
+        for position, query_text in enumerate(query_texts):
+            for act in self.route(query_text):
+                groups.setdefault(act, []).append(position)
+
+        def search_shard(act):
+            positions = groups[act]
+            texts = [query_texts[position] for position in positions]
+            vectors = [query_vectors[position] for position in positions]
+            return act, dict(zip(positions, self.shard(act).search_many(texts, vectors, k, candidates)))
+
+        if len(groups) == 1:
+            results = [search_shard(act) for act in groups]
+        else:
+            results = list(self.pool.map(search_shard, groups))
+
+        rankings = [[] for _ in query_texts]
+        for _, hits in results:
+            for position, documents in hits.items():
+                rankings[position].append(documents)
+        return [ranked[0] if len(ranked) == 1 else reciprocal_rank_fusion(ranked, k) for ranked in rankings]
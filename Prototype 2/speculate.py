@@ -0,0 +1,58 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import SPECULATIVE_OVERLAP, SPECULATIVE_WORKERS
+from hybrid import chunk_key, reciprocal_rank_fusion
+
+# Speculative retrieval: while the LLM rephrases a question, the raw question is embedded
+# and searched, so retrieval no longer waits for the rephrase to start.
+#
+# Once the rephrase is back, BM25 alone searches the rephrased text (no embedding). If those
+# chunks share at least SPECULATIVE_OVERLAP with BM25's chunks for the raw question, the
+# rephrase added no new wording to search on: the raw results are used as they are and the
+# raw query's vector stands in for the rephrased one (semantic cache, section titles), so
+# nothing waits on a second embedding or search. Otherwise the rephrased query is embedded
+# and searched as usual, and both candidate sets are fused by reciprocal rank. Without a
+# HybridRetriever there is no cheap probe, and the two sets are always fused.
+#
+# Only questions that would go to the LLM are speculated on: a memoised or skipped rephrase
+# returns at once and its search runs as usual.
+
+
+def overlap(first, second):
+    # Share of `second`'s chunks that are also in `first`.
+    if not second:
+        return 0.0
+    keys = {chunk_key(document) for document in first}
+    return sum(chunk_key(document) in keys for document in second) / len(second)
+
+
+class Speculator:
+
+    def __init__(self, threshold=SPECULATIVE_OVERLAP, workers=SPECULATIVE_WORKERS):
+        self.threshold = threshold
+        # The rephrase runs here; the raw search stays on the caller's thread.
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rephrase")
+        self.stats = {"speculated": 0, "reused": 0, "merged": 0}
+        self.lock = threading.Lock()
+
+    def count(self, outcome):
+        with self.lock:
+            self.stats[outcome] += 1
+
+    def submit(self, function, *args):
+        self.count("speculated")
+        return self.pool.submit(function, *args)
+
+    def reuse(self, raw, probe):
+        # (reuse the raw results?, share of the rephrased probe's chunks in the raw ones)
+        shared = overlap(raw, probe)
+        reused = shared >= self.threshold
+        if reused:
+            self.count("reused")
+        return reused, shared
+
+    def merge(self, rephrased, raw, k):
+        # Counted here rather than in reuse(), which never runs without a HybridRetriever.
+        self.count("merged")
+        return reciprocal_rank_fusion([rephrased, raw], k)
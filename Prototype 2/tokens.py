@@ -0,0 +1,20 @@
+import math
+import re
+
+# llama2:7b's context window, shared by the prompt, retrieved context and the answer.
+LLAMA2_CONTEXT_WINDOW = 4096
+
+TOKEN_PIECE = re.compile(r"\w+|[^\w\s]")
+
+
+# Estimated Llama-2 token count without loading a tokenizer: SentencePiece splits
+# English legal text into roughly 1.3 pieces per word, and each punctuation mark is one.
+def count_tokens(text):
+    words = 0
+    punctuation = 0
+    for piece in TOKEN_PIECE.findall(text):
+        if piece[0].isalnum() or piece[0] == "_":
+            words += 1
+        else:
+            punctuation += 1
+    return math.ceil(words * 1.3) + punctuation
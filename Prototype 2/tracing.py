@@ -0,0 +1,98 @@
+import json
+import logging
+import logging.handlers
+import time
+import uuid
+from contextlib import contextmanager
+
+from prometheus_client import Counter, Histogram, start_http_server
+
+from config import METRICS_PORT, TRACE_LOG_BACKUPS, TRACE_LOG_MAX_BYTES, TRACE_LOG_PATH
+
+# Per-request traces for the answer pipeline.
+#
+# A Trace is a list of spans (rephrase, embed, search, prompt, generate, ...), each with
+# its offset from the start of the request, its duration and stage-specific attributes
+# such as token counts. Finished traces feed the Prometheus histograms below and, when
+# TRACE_LOG_PATH is set, are written as one JSON line to that (size-rotated) file.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+STAGE_SECONDS = Histogram(
+    "legal_aid_stage_seconds", "Time spent in each pipeline stage.", ["stage"], buckets=LATENCY_BUCKETS
+)
+REQUEST_SECONDS = Histogram(
+    "legal_aid_request_seconds", "End-to-end answer latency.", ["cache"], buckets=LATENCY_BUCKETS
+)
+FIRST_TOKEN_SECONDS = Histogram(
+    "legal_aid_first_token_seconds", "Time from request start to the first answer token.", buckets=LATENCY_BUCKETS
+)
+TOKENS_PER_SECOND = Histogram(
+    "legal_aid_generation_tokens_per_second", "Answer generation speed (estimated tokens).",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200),
+)
+PROMPT_TOKENS = Histogram(
+    "legal_aid_prompt_tokens", "Estimated tokens of context, sections and question sent to the LLM.",
+    buckets=(128, 256, 512, 1024, 2048, 3072, 4096, 8192),
+)
+ANSWERS = Counter("legal_aid_answers_total", "Answers served.", ["cache", "rephrase"])
+
+logger = logging.getLogger("legal_aid.trace")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+if TRACE_LOG_PATH:
+    handler = logging.handlers.RotatingFileHandler(
+        TRACE_LOG_PATH, maxBytes=TRACE_LOG_MAX_BYTES, backupCount=TRACE_LOG_BACKUPS, encoding="utf-8", delay=True
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+
+
+class Trace:
+    # Each span's duration is also added to `timings` under the span's name, so the
+    # result's "timings" dict and format_timings() keep working unchanged.
+
+    def __init__(self, timings=None):
+        self.id = uuid.uuid4().hex
+        self.started = time.time()
+        self.start = time.perf_counter()
+        self.timings = {} if timings is None else timings
+        self.spans = []
+        self.attributes = {}
+
+    @contextmanager
+    def span(self, name, **attributes):
+        span = {"name": name, "offset": time.perf_counter() - self.start, "duration": None, **attributes}
+        self.spans.append(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span["duration"] = time.perf_counter() - start
+            self.timings[name] = self.timings.get(name, 0.0) + span["duration"]
+            STAGE_SECONDS.labels(name).observe(span["duration"])
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def to_dict(self):
+        return {"trace_id": self.id, "time": self.started, **self.attributes, "spans": self.spans}
+
+    def finish(self, **attributes):
+        self.attributes.update(attributes, total=self.elapsed())
+        REQUEST_SECONDS.labels(self.attributes.get("cache", "miss")).observe(self.attributes["total"])
+        ANSWERS.labels(self.attributes.get("cache", "miss"), str(self.attributes.get("rephrase"))).inc()
+        for span in self.spans:
+            if "prompt_tokens" in span:
+                PROMPT_TOKENS.observe(span["prompt_tokens"])
+            if "first_token" in span:
+                FIRST_TOKEN_SECONDS.observe(span["first_token"])
+            if span.get("tokens_per_second"):
+                TOKENS_PER_SECOND.observe(span["tokens_per_second"])
+        logger.info(json.dumps(self.to_dict(), default=str))
+
+
+def start_metrics_server(port=METRICS_PORT):
+    # For processes without their own HTTP server (Streamlit); a port of 0 leaves it off.
+    if port:
+        start_http_server(port)
@@ -0,0 +1,101 @@
+import argparse
+import json
+import os
+import time
+
+import faiss
+import numpy as np
+
+from config import BASE_DIR, FAISS_INDEX_PATH
+from index_store import INDEX_FILE, MMAP_FLAGS, read_metadata
+from index_types import INDEX_TYPES, build_index, index_spec, set_search_params, stored_vectors
+
+# Compares FAISS index types on an existing index, to pick one per corpus. For every type,
+# and every nprobe / efSearch value worth trying, it reports recall@k against exact search
+# on the same vectors, the serialized index size, build (training) time and per-query
+# search latency. Apply the chosen setting with `python ingest.py --index-type ...`.
+#
+#   python tune_index.py                        # bench queries, embedded with the index's embedder
+#   python tune_index.py --sample 500 -k 10     # 500 stored vectors as queries, no embedder needed
+
+QUERIES_PATH = os.path.join(BASE_DIR, "data", "bench_queries.json")
+SEARCH_SWEEP = {"nprobe": (1, 2, 4, 8, 16, 32, 64), "efSearch": (16, 32, 64, 128, 256)}
+
+
+def query_vectors(args, metadata, vectors):
+    if args.sample:
+        rng = np.random.default_rng(0)
+        return vectors[rng.choice(len(vectors), min(args.sample, len(vectors)), replace=False)]
+    from embedding_backend import get_embeddings
+
+    with open(args.queries, encoding="utf-8") as f:
+        queries = [item["query"] for item in json.load(f)]
+    embeddings = get_embeddings(metadata["backend"], metadata["model"])
+    return np.asarray(embeddings.embed_documents(queries), dtype=np.float32)
+
+
+def search_stats(index, queries, truth, k):
+    latencies = []
+    found = 0
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        _, positions = index.search(query[None, :], k)
+        latencies.append(time.perf_counter() - start)
+        found += len(set(positions[0]) & set(expected))
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+    return found / truth.size, np.mean(latencies) * 1000, p95 * 1000
+
+
+def sweep_values(spec, index):
+    if "nprobe" in spec:
+        nlist = faiss.extract_index_ivf(index).nlist
+        return "nprobe", [value for value in SEARCH_SWEEP["nprobe"] if value <= nlist]
+    if "efSearch" in spec:
+        return "efSearch", SEARCH_SWEEP["efSearch"]
+    return None, [None]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare FAISS index types on the current index.")
+    parser.add_argument("--index-path", default=FAISS_INDEX_PATH)
+    parser.add_argument("--types", nargs="+", default=list(INDEX_TYPES), choices=INDEX_TYPES)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--queries", default=QUERIES_PATH)
+    parser.add_argument("--sample", type=int, default=0, help="use this many stored vectors as queries")
+    parser.add_argument("--nlist", type=int, default=0)
+    parser.add_argument("--pq-m", type=int, default=0)
+    args = parser.parse_args()
+
+    metadata = read_metadata(args.index_path)
+    exact = faiss.read_index(os.path.join(args.index_path, INDEX_FILE), MMAP_FLAGS)
+    vectors = stored_vectors(exact)
+    queries = query_vectors(args, metadata, vectors)
+    _, truth = exact.search(queries, args.k)
+    print(
+        f"{exact.ntotal} vectors of dimension {exact.d}, {len(queries)} queries, "
+        f"current: {metadata.get('search_index', {}).get('factory', 'Flat')}"
+    )
+    print(f"{'type':>9} {'factory':>16} {'param':>12} {'recall@' + str(args.k):>9} {'MB':>7} {'build s':>8} "
+          f"{'mean ms':>8} {'p95 ms':>7}")
+
+    for index_type in args.types:
+        spec = index_spec(index_type, exact.d, exact.ntotal, nlist=args.nlist, pq_m=args.pq_m)
+        start = time.perf_counter()
+        index = build_index(vectors, spec, exact.metric_type)
+        build_seconds = time.perf_counter() - start
+        megabytes = faiss.serialize_index(index).size / 2 ** 20
+        name, values = sweep_values(spec, index)
+        for value in values:
+            if name is not None:
+                set_search_params(index, {name: value})
+            recall, mean_ms, p95_ms = search_stats(index, queries, truth, args.k)
+            param = f"{name}={value}" if name else ""
+            print(
+                f"{index_type:>9} {spec['factory']:>16} {param:>12} {recall:>9.3f} {megabytes:>7.2f} "
+                f"{build_seconds:>8.2f} {mean_ms:>8.3f} {p95_ms:>7.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()